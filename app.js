@@ -65,6 +65,11 @@ let activeTournamentFilter = 'todos';
 let teamsData = [];
 let tournamentsData = [];
 let useDateFilter = true; // When team is selected, this becomes false
+let matchDates = null; // data/by-date/index.json: { 'YYYY-MM-DD': count }, null = shards unavailable
+let seasonLoaded = false;
+let liveData = null; // data/live.json: { schedule, matches: [{ id, status, score }] }
+const loadedDateShards = new Set();
+const loadedMatchIds = new Set();
 
 // === DOM ELEMENTS ===
 const elements = {
@@ -112,25 +117,92 @@ function isSameDay(date1, date2) {
     date1.getDate() === date2.getDate();
 }
 
+function toDateKey(date) {
+  const month = String(date.getMonth() + 1).padStart(2, '0');
+  const day = String(date.getDate()).padStart(2, '0');
+  return `${date.getFullYear()}-${month}-${day}`;
+}
+
 // === DATA LOADING ===
+function addMatches(matches) {
+  // Shards may be older than live.json; its status and score win
+  if (liveData) applyLive(matches, liveData.matches);
+  matches.forEach(match => {
+    if (!loadedMatchIds.has(match.id)) {
+      loadedMatchIds.add(match.id);
+      allMatches.push(match);
+    }
+  });
+}
+
+async function fetchJSON(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`${url}: HTTP ${res.status}`);
+  return res.json();
+}
+
+// Whole season; needed when a team is selected. Prefers the cacheable compact
+// schedule named in live.json (see data-decoder.js) over the pretty-printed file.
+async function loadSeason() {
+  if (seasonLoaded) return;
+  let matches;
+  try {
+    if (!liveData) throw new Error('data/live.json unavailable');
+    matches = decodeMatches(await fetchJSON(`data/${liveData.schedule}`));
+  } catch (error) {
+    console.warn('Falling back to data/matches.json:', error);
+    matches = (await fetchJSON('data/matches.json')).matches;
+  }
+  addMatches(matches);
+  seasonLoaded = true;
+}
+
+// Shards are keyed by the Brasília calendar day; the neighbours cover
+// visitors whose local day differs from it
+async function loadMatchesAround(date) {
+  if (seasonLoaded) return;
+  if (!matchDates) return loadSeason();
+
+  const keys = [-1, 0, 1]
+    .map(offset => {
+      const day = new Date(date);
+      day.setDate(day.getDate() + offset);
+      return toDateKey(day);
+    })
+    .filter(key => key in matchDates && !loadedDateShards.has(key));
+
+  try {
+    const shards = await Promise.all(keys.map(key => fetchJSON(`data/by-date/${key}.json`)));
+    keys.forEach(key => loadedDateShards.add(key));
+    shards.forEach(shard => addMatches(shard.matches));
+  } catch (error) {
+    console.warn('Falling back to data/matches.json:', error);
+    await loadSeason();
+  }
+}
+
+// Load the matches the current filters can show
+function loadVisibleMatches() {
+  return useDateFilter ? loadMatchesAround(currentDate) : loadSeason();
+}
+
 async function loadData() {
   try {
-    const [matchesRes, teamsRes, tournamentsRes, canaisRes] = await Promise.all([
-      fetch('data/matches.json'),
-      fetch('data/teams.json'),
-      fetch('data/tournaments.json'),
-      fetch('data/canais.json')
+    const [teamsDataRes, tournamentsDataRes, canaisDataRes, datesIndex, live] = await Promise.all([
+      fetchJSON('data/teams.json'),
+      fetchJSON('data/tournaments.json'),
+      fetchJSON('data/canais.json'),
+      fetchJSON('data/by-date/index.json').catch(() => null),
+      fetchJSON('data/live.json').catch(() => null)
     ]);
 
-    const matchesData = await matchesRes.json();
-    const teamsDataRes = await teamsRes.json();
-    const tournamentsDataRes = await tournamentsRes.json();
-    const canaisDataRes = await canaisRes.json();
-
-    allMatches = matchesData.matches;
     teamsData = teamsDataRes.teams;
     tournamentsData = tournamentsDataRes.tournaments;
     canaisData = canaisDataRes.canais;
+    matchDates = datesIndex ? datesIndex.dates : null;
+    liveData = live;
+
+    await loadVisibleMatches();
 
     return true;
   } catch (error) {
@@ -391,7 +463,9 @@ function handleTeamFilter(e) {
   // When "todos" is selected, enable date filter
   useDateFilter = (team === 'todos');
 
-  filterMatches();
+  loadVisibleMatches()
+    .catch(error => console.error('Error loading matches:', error))
+    .then(filterMatches);
 }
 
 function handleTournamentFilter(e) {
@@ -409,7 +483,9 @@ function handleDateChange(direction) {
   }
 
   updateDateDisplay();
-  filterMatches();
+  loadVisibleMatches()
+    .catch(error => console.error('Error loading matches:', error))
+    .then(filterMatches);
 }
 
 // === INITIALIZATION ===
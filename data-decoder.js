@@ -0,0 +1,63 @@
+// Data-decoder.js - Decodes data/schedule.<hash>.json and data/live.json (written by
+// spiders/compact_export.py) back into the match objects of data/matches.json
+
+// Rebuild a matchDate string ('2026-01-18T16:00:00-03:00') from epoch seconds
+function formatMatchDate(kickoff, tzMinutes) {
+  const local = new Date((kickoff + tzMinutes * 60) * 1000);
+  const pad = n => String(n).padStart(2, '0');
+  const offset = Math.abs(tzMinutes);
+  return `${local.getUTCFullYear()}-${pad(local.getUTCMonth() + 1)}-${pad(local.getUTCDate())}` +
+    `T${pad(local.getUTCHours())}:${pad(local.getUTCMinutes())}:${pad(local.getUTCSeconds())}` +
+    `${tzMinutes < 0 ? '-' : '+'}${pad(Math.floor(offset / 60))}:${pad(offset % 60)}`;
+}
+
+function decodeMatches(payload) {
+  const ref = (table, index) => (index === null ? null : payload[table][index]);
+
+  return payload.matches.map(row => {
+    const [id, tournament, home, away, kickoff, round, status,
+      scoreHome, scoreAway, venue, broadcasts, matchURL, extra = {}] = row;
+
+    const match = {
+      id,
+      tournament: ref('tournaments', tournament),
+      homeTeam: ref('teams', home),
+      awayTeam: ref('teams', away),
+      matchDate: kickoff === null ? null : formatMatchDate(kickoff, payload.tz),
+      round: ref('rounds', round),
+      status: ref('statuses', status),
+      score: { home: scoreHome, away: scoreAway },
+      venue: ref('venues', venue),
+      broadcasting: broadcasts === null ? null : broadcasts.map(i => payload.broadcasts[i]),
+      matchURL
+    };
+
+    if (payload.live === false) {
+      // Status and score come from live.json (see applyLive)
+      delete match.status;
+      delete match.score;
+    }
+    (extra.$missing || []).forEach(key => delete match[key]);
+    Object.keys(extra).forEach(key => {
+      if (key !== '$missing') match[key] = extra[key];
+    });
+    return match;
+  });
+}
+
+// Copy status and score from live.json entries onto matches (in place)
+function applyLive(matches, liveEntries) {
+  const liveById = new Map(liveEntries.map(entry => [entry.id, entry]));
+  matches.forEach(match => {
+    const entry = liveById.get(match.id);
+    if (!entry) return;
+    if ('status' in entry) match.status = entry.status;
+    if ('score' in entry) match.score = entry.score;
+  });
+  return matches;
+}
+
+// Export for use in other scripts
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { decodeMatches, applyLive, formatMatchDate };
+}
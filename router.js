@@ -6,20 +6,23 @@ class Router {
     this.teamsData = null;
     this.tournamentsData = null;
     this.matchesData = null;
+    this.teamShards = {};
   }
 
-  // Load all data files
-  async loadData() {
+  // Load all data files (pass false to skip the full-season matches.json)
+  async loadData(includeMatches = true) {
     try {
       const [teams, tournaments, matches] = await Promise.all([
         fetch('/data/teams.json').then(r => r.json()),
         fetch('/data/tournaments.json').then(r => r.json()),
-        fetch('/data/matches.json').then(r => r.json())
+        includeMatches ? fetch('/data/matches.json').then(r => r.json()) : null
       ]);
 
       this.teamsData = teams.teams;
       this.tournamentsData = tournaments.tournaments;
-      this.matchesData = matches.matches;
+      if (matches) {
+        this.matchesData = matches.matches;
+      }
 
       return true;
     } catch (error) {
@@ -28,6 +31,46 @@ class Router {
     }
   }
 
+  // Load one team's precomputed matches (data/by-team/<id>.json), falling
+  // back to the full matches.json if the shard is missing
+  async loadTeamMatches(teamId) {
+    if (this.teamShards[teamId]) return true;
+    try {
+      const res = await fetch(`/data/by-team/${teamId}.json`);
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      this.teamShards[teamId] = await res.json();
+      return true;
+    } catch (error) {
+      console.warn(`No match shard for ${teamId}, loading all matches:`, error);
+      if (!this.matchesData) {
+        const matches = await fetch('/data/matches.json').then(r => r.json());
+        this.matchesData = matches.matches;
+      }
+      return false;
+    }
+  }
+
+  // Loaded shard of a team, looked up by id or slug
+  getTeamShard(teamSlug) {
+    const team = this.getTeamBySlug(teamSlug);
+    return this.teamShards[team ? team.id : teamSlug] || null;
+  }
+
+  // Split a team shard at the current time. The build splits on status, so
+  // matches that kicked off since then (but are not finished) move to past.
+  splitTeamShard(shard) {
+    const now = Date.now();
+    const upcoming = [];
+    const started = [];
+    shard.upcoming.forEach(match => {
+      (match.kickoff >= now || match.isLive ? upcoming : started).push(match);
+    });
+    const past = started.length
+      ? [...started, ...shard.past].sort((a, b) => b.kickoff - a.kickoff)
+      : shard.past;
+    return { upcoming, past };
+  }
+
   // Parse match URL: /paulistao26/saopaulo-vs-corinthians/18-01-2026
   parseMatchURL(pathname) {
     // Remove leading/trailing slashes and split
@@ -108,6 +151,8 @@ class Router {
 
   // Get all matches for a team
   getMatchesByTeam(teamSlug) {
+    const shard = this.getTeamShard(teamSlug);
+    if (shard) return [...shard.upcoming, ...shard.past];
     if (!this.matchesData) return [];
     return this.matchesData.filter(match =>
       match.homeTeam === teamSlug || match.awayTeam === teamSlug
@@ -116,6 +161,8 @@ class Router {
 
   // Get upcoming matches for a team
   getUpcomingMatchesByTeam(teamSlug, limit = 5) {
+    const shard = this.getTeamShard(teamSlug);
+    if (shard) return this.splitTeamShard(shard).upcoming.slice(0, limit);
     const now = new Date();
     return this.getMatchesByTeam(teamSlug)
       .filter(match => new Date(match.matchDate) >= now || match.isLive)
@@ -125,6 +172,8 @@ class Router {
 
   // Get recent matches for a team
   getRecentMatchesByTeam(teamSlug, limit = 5) {
+    const shard = this.getTeamShard(teamSlug);
+    if (shard) return this.splitTeamShard(shard).past.slice(0, limit);
     const now = new Date();
     return this.getMatchesByTeam(teamSlug)
       .filter(match => new Date(match.matchDate) < now && !match.isLive)
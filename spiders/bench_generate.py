@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Match Page Generator Benchmark
+Synthesizes matches.json, teams.json, tournaments.json and canais.json at the
+requested sizes, runs generate_match_pages into a temporary copy of the site and
+reports pages per second, peak RSS and bytes written.
+
+Each size is built twice: a cold build (every page rendered) and a warm rerun
+with unchanged inputs (what the hourly cron job usually does).
+
+Usage:
+    python spiders/bench_generate.py
+    python spiders/bench_generate.py --matches 100 5000 50000 --teams 20 2000 --workers 0
+    python spiders/bench_generate.py --matches 10000 --no-compress --output bench.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+SPIDERS_DIR = BASE_DIR / 'spiders'
+
+CHANNELS = [
+    ('globo', 'TV Globo', 'tv-aberta'), ('record', 'Record', 'tv-aberta'), ('band', 'Band', 'tv-aberta'),
+    ('sbt', 'SBT', 'tv-aberta'), ('sportv', 'SporTV', 'pay-tv'), ('premiere', 'Premiere', 'pay-tv'),
+    ('cazetv', 'CazéTV', 'streaming'), ('youtube', 'YouTube', 'streaming'), ('max', 'Max', 'streaming'),
+    ('tnt', 'TNT', 'pay-tv'), ('disneyplus', 'Disney+', 'streaming'), ('goattv', 'Goat TV', 'streaming'),
+]
+STATES = ['SP', 'RJ', 'MG', 'RS', 'PR', 'BA', 'PE', 'CE', 'SC', 'GO']
+
+MATCHES_PER_DAY = 10
+SEASON_DAYS = 300
+
+
+def round_robin(members):
+    """Ordered (home, away) pairs of a double round-robin: every pair once each way."""
+    slots = list(members) + ([None] if len(members) % 2 else [])
+    pairs = []
+    for turn in range(len(slots) - 1):
+        for k in range(len(slots) // 2):
+            home, away = slots[k], slots[-1 - k]
+            if home is not None and away is not None:
+                pairs.append((home, away) if turn % 2 else (away, home))
+        # Circle method: the first slot stays, the others rotate
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return pairs + [(away, home) for home, away in pairs]
+
+
+def synthesize_data(num_matches, num_teams, seed=0):
+    """Return (matches, teams, tournaments, canais) payloads shaped like data/*.json."""
+    rng = random.Random(seed)
+
+    teams = []
+    for i in range(num_teams):
+        team_id = f"time{i:04d}"
+        teams.append({
+            "id": team_id,
+            "name": f"Esporte Clube São Time {i}",
+            "slug": team_id,
+            "logo": f"/assets/times/{team_id}.png",
+            "state": STATES[i % len(STATES)],
+            "stadium": f"Estádio Municipal {i}",
+            "founded": 1900 + i % 120,
+            "tournaments": [],
+            "colors": {"primary": "#000000", "secondary": "#FFFFFF"},
+        })
+
+    # Roughly 20 teams per tournament, like a state championship
+    num_tournaments = max(1, num_teams // 20)
+    tournaments = []
+    for t in range(num_tournaments):
+        tournament_id = f"campeonato{t:03d}26"
+        members = [team['id'] for team in teams[t::num_tournaments]]
+        for team in teams[t::num_tournaments]:
+            team['tournaments'].append(tournament_id)
+        tournaments.append({
+            "id": tournament_id,
+            "name": f"Campeonato Sintético {t} 2026",
+            "shortName": f"Sintético {t}",
+            "slug": tournament_id,
+            "year": 2026,
+            "status": "active",
+            "logo": f"/assets/campeonatos/{tournament_id}.png",
+            "teams": members,
+        })
+
+    canais = [{
+        "id": channel_id,
+        "name": name,
+        "fullName": name,
+        "slug": channel_id,
+        "logo": f"/assets/canais/{channel_id}.png",
+        "type": channel_type,
+        "thirdpartyurl": "https://example.com/",
+    } for channel_id, name, channel_type in CHANNELS]
+
+    # A tournament's fixtures follow its round-robin, so the same pairing never
+    # falls twice on one day (it would map to the same match page)
+    fixtures = [round_robin(t['teams'] if len(t['teams']) >= 2 else [team['id'] for team in teams])
+                for t in tournaments]
+    per_day = min(MATCHES_PER_DAY, min(len(f) for f in fixtures) * num_tournaments)
+
+    season_start = datetime(2026, 1, 10, 16, 0, tzinfo=timezone(timedelta(hours=-3)))
+    matches = []
+    for i in range(num_matches):
+        tournament = tournaments[i % num_tournaments]
+        tournament_fixtures = fixtures[i % num_tournaments]
+        home, away = tournament_fixtures[i // num_tournaments % len(tournament_fixtures)]
+        # Ten-month seasons, one per year
+        day = i // per_day
+        match_date = season_start + timedelta(days=day % SEASON_DAYS + 365 * (day // SEASON_DAYS),
+                                              hours=rng.choice([0, 2, 4]))
+        finished = rng.random() < 0.5
+        matches.append({
+            "id": f"{tournament['id']}-{home}-vs-{away}-{i}",
+            "tournament": tournament['id'],
+            "homeTeam": home,
+            "awayTeam": away,
+            "matchDate": match_date.isoformat(),
+            "round": f"{day + 1}ª Rodada",
+            "status": "finished" if finished else "scheduled",
+            "score": {"home": rng.randint(0, 4), "away": rng.randint(0, 4)} if finished
+                     else {"home": None, "away": None},
+            "venue": {"name": f"Estádio Municipal {i % num_teams}", "city": "Cidade", "state": "SP"},
+            "broadcasting": [{"channel": name, "type": channel_type}
+                             for _, name, channel_type in rng.sample(CHANNELS, rng.randint(1, 2))],
+        })
+
+    # One page per match, or the benchmark counts pages it never wrote
+    page_paths = {(m['tournament'], m['matchDate'][:10], m['homeTeam'], m['awayTeam']) for m in matches}
+    assert len(page_paths) == len(matches), "synthetic matches share match page paths"
+
+    return {"matches": matches}, {"teams": teams}, {"tournaments": tournaments}, {"canais": canais}
+
+
+def prepare_site(site_dir, num_matches, num_teams, seed=0):
+    """Create a minimal site in site_dir: template, spider modules and synthetic data."""
+    (site_dir / 'spiders').mkdir(parents=True)
+    (site_dir / 'data').mkdir()
+    for module in SPIDERS_DIR.glob('*.py'):
+        shutil.copy2(module, site_dir / 'spiders' / module.name)
+    shutil.copy2(BASE_DIR / 'match.html', site_dir / 'match.html')
+
+    for name, payload in zip(['matches', 'teams', 'tournaments', 'canais'],
+                             synthesize_data(num_matches, num_teams, seed)):
+        with open(site_dir / 'data' / (name + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def snapshot_sizes(site_dir):
+    """Return {relative path: (size, mtime_ns)} for every file in the site."""
+    sizes = {}
+    for root, _, files in os.walk(site_dir):
+        for name in files:
+            path = Path(root) / name
+            stat = path.stat()
+            sizes[path.relative_to(site_dir).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return sizes
+
+
+def run_generator(site_dir, generator_args):
+    """Run the generator in a subprocess. Returns (seconds, peak RSS in bytes or None, output)."""
+    command = [sys.executable, str(site_dir / 'spiders' / 'generate_match_pages.py')] + generator_args
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=site_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    peak_rss = None
+    if hasattr(os, 'wait4'):
+        # Capture the rusage of this child (and the workers it waited for) before Popen reaps it
+        output = proc.stdout.read()
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    else:
+        output, _ = proc.communicate()
+    elapsed = time.perf_counter() - start
+
+    output = output.decode('utf-8', errors='replace')
+    if proc.returncode != 0:
+        raise RuntimeError(f"Generator failed with exit code {proc.returncode}:\n{output}")
+    return elapsed, peak_rss, output
+
+
+def bytes_written(before, after):
+    """Bytes of every file created or rewritten between two snapshots."""
+    return sum(size for path, (size, mtime) in after.items()
+               if before.get(path, (None, None))[1] != mtime)
+
+
+def benchmark(num_matches, num_teams, generator_args, keep=False, seed=0):
+    """Cold build and warm rerun of one synthetic site. Returns a list of result dicts."""
+    site_dir = Path(tempfile.mkdtemp(prefix='bench-site-'))
+    results = []
+    try:
+        prepare_site(site_dir, num_matches, num_teams, seed)
+        for phase in ('cold', 'warm'):
+            before = snapshot_sizes(site_dir)
+            elapsed, peak_rss, _ = run_generator(site_dir, generator_args)
+            after = snapshot_sizes(site_dir)
+            results.append({
+                "phase": phase,
+                "matches": num_matches,
+                "teams": num_teams,
+                "seconds": round(elapsed, 3),
+                "pages_per_second": round(num_matches / elapsed, 1) if elapsed else None,
+                "peak_rss_mb": round(peak_rss / (1024 * 1024), 1) if peak_rss is not None else None,
+                "bytes_written": bytes_written(before, after),
+            })
+    finally:
+        if keep:
+            print(f"[INFO] Site kept at: {site_dir}")
+        else:
+            shutil.rmtree(site_dir, ignore_errors=True)
+    return results
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate_match_pages on synthetic seasons")
+    parser.add_argument('--matches', type=int, nargs='+', default=[100, 1000],
+                        help="match counts to benchmark (e.g. 100 5000 50000)")
+    parser.add_argument('--teams', type=int, nargs='+', default=[20],
+                        help="team counts to benchmark (e.g. 20 2000)")
+    parser.add_argument('--workers', type=int, default=1, help="passed to the generator")
+    parser.add_argument('--slim-data', action='store_true', help="passed to the generator")
+    parser.add_argument('--no-compress', action='store_true', help="passed to the generator")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the synthetic data")
+    parser.add_argument('--keep', action='store_true', help="keep the temporary sites for inspection")
+    parser.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    generator_args = ['--workers', str(args.workers)]
+    if args.slim_data:
+        generator_args.append('--slim-data')
+    if args.no_compress:
+        generator_args.append('--no-compress')
+
+    print("=" * 78)
+    print("MATCH PAGE GENERATOR BENCHMARK")
+    print("Generator args: " + " ".join(generator_args))
+    print("=" * 78)
+    print(f"{'phase':<6} {'matches':>8} {'teams':>6} {'seconds':>9} {'pages/s':>10} {'peak RSS':>10} {'written':>12}")
+    print("-" * 78)
+
+    all_results = []
+    for num_teams in args.teams:
+        for num_matches in args.matches:
+            for result in benchmark(num_matches, num_teams, generator_args, keep=args.keep, seed=args.seed):
+                all_results.append(result)
+                rss = f"{result['peak_rss_mb']} MB" if result['peak_rss_mb'] is not None else "n/a"
+                print(f"{result['phase']:<6} {result['matches']:>8} {result['teams']:>6} "
+                      f"{result['seconds']:>9.2f} {result['pages_per_second']:>10} {rss:>10} "
+                      f"{format_bytes(result['bytes_written']):>12}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"generator_args": generator_args, "results": all_results}, f, indent=2)
+        print(f"\n[OK] Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Data Catalog
+Loads data/matches.json, teams.json, tournaments.json and canais.json once and
+indexes them, so scripts look entries up in O(1) instead of scanning lists:
+
+    catalog = load_catalog()
+    catalog.match('paulistao26-santos-vs-guarani')
+    catalog.matches_for_team('santos')
+    catalog.matches_on('2026-01-18')
+    catalog.matches_in_round('paulistao26', '1ª Rodada')
+    catalog.team('São Paulo')            # id, slug, name or alias
+    catalog.channel('Cazé TV')           # canais.json entry for a broadcast name
+
+The indexes hold references to the loaded dicts, so edits made through them are
+saved with the raw documents (catalog.matches_data, catalog.teams_data, ...).
+Call reindex() after changing a field the indexes are keyed on.
+"""
+
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+
+DATA_FILES = {
+    'matches': 'matches.json',
+    'teams': 'teams.json',
+    'tournaments': 'tournaments.json',
+    'canais': 'canais.json',
+}
+
+# Same mapping as channelAliases in match.html: broadcast channel name -> canais.json id
+CHANNEL_ALIASES = {
+    'record': 'record',
+    'tv globo': 'globo',
+    'globo': 'globo',
+    'band': 'band',
+    'sbt': 'sbt',
+    'rede-tv': 'redetv',
+    'redetv': 'redetv',
+    'redetv!': 'redetv',
+    'tv-cultura': 'tvcultura',
+    'tv cultura': 'tvcultura',
+    'cultura': 'tvcultura',
+    'sportv': 'sportv',
+    'premiere': 'premiere',
+    'cazetv': 'cazetv',
+    'cazétv': 'cazetv',
+    'caze tv': 'cazetv',
+    'youtube': 'youtube',
+    'hbo-max': 'max',
+    'hbo max': 'max',
+    'max': 'max',
+    'disneyplus': 'disneyplus',
+    'disney+': 'disneyplus',
+    'disney plus': 'disneyplus',
+    'goat-tv': 'goattv',
+    'goat tv': 'goattv',
+    'goattv': 'goattv',
+    'tnt': 'tnt',
+    'tnt sports': 'tnt',
+}
+
+
+def alias_key(name):
+    """Fold a team name, id or slug to the key used by the alias index ('São Paulo' -> 'saopaulo')."""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]', '', text.lower())
+
+
+def match_day(match):
+    """Local calendar day of a match as 'YYYY-MM-DD' (matchDate keeps the Brasília offset)."""
+    match_date = match.get('matchDate')
+    if not match_date:
+        return None
+    try:
+        return datetime.fromisoformat(match_date.replace('Z', '+00:00')).date().isoformat()
+    except ValueError:
+        return None
+
+
+def _read_json(path, default):
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Catalog:
+    """The site data files plus their lookup indexes."""
+
+    def __init__(self, matches_data=None, teams_data=None, tournaments_data=None, canais_data=None):
+        self.matches_data = matches_data if matches_data is not None else {"matches": []}
+        self.teams_data = teams_data if teams_data is not None else {"teams": []}
+        self.tournaments_data = tournaments_data if tournaments_data is not None else {"tournaments": []}
+        self.canais_data = canais_data if canais_data is not None else {"canais": []}
+        self.reindex()
+
+    @classmethod
+    def load(cls, data_dir=DATA_DIR):
+        """Parse the data files in data_dir; missing files load as empty."""
+        data_dir = Path(data_dir)
+        documents = {name: _read_json(data_dir / filename, {name: []})
+                     for name, filename in DATA_FILES.items()}
+        return cls(documents['matches'], documents['teams'], documents['tournaments'], documents['canais'])
+
+    @property
+    def matches(self):
+        return self.matches_data.setdefault('matches', [])
+
+    @property
+    def teams(self):
+        return self.teams_data.setdefault('teams', [])
+
+    @property
+    def tournaments(self):
+        return self.tournaments_data.setdefault('tournaments', [])
+
+    @property
+    def canais(self):
+        return self.canais_data.setdefault('canais', [])
+
+    def reindex(self):
+        """Rebuild every index from the loaded documents."""
+        self.match_by_id = {}
+        self.matches_by_team = defaultdict(list)
+        self.matches_by_date = defaultdict(list)
+        self.matches_by_tournament = defaultdict(list)
+        self.matches_by_round = defaultdict(list)
+        for match in self.matches:
+            self._index_match(match)
+
+        self.team_by_id = {}
+        self.team_by_slug = {}
+        self.team_by_alias = {}
+        for team in self.teams:
+            self._index_team(team)
+
+        self.tournament_by_id = {t['id']: t for t in self.tournaments if 'id' in t}
+
+        self.channel_by_id = {}
+        self.channel_by_name = {}
+        for channel in self.canais:
+            for key in (channel.get('id'), channel.get('slug')):
+                if key is not None:
+                    self.channel_by_id.setdefault(key, channel)
+            for name in (channel.get('name'), channel.get('fullName'), channel.get('id')):
+                if name:
+                    self.channel_by_name.setdefault(name.lower().strip(), channel)
+        for name, channel_id in CHANNEL_ALIASES.items():
+            if channel_id in self.channel_by_id:
+                self.channel_by_name.setdefault(name, self.channel_by_id[channel_id])
+
+    def _index_match(self, match):
+        if 'id' in match:
+            self.match_by_id[match['id']] = match
+        for team_id in {match.get('homeTeam'), match.get('awayTeam')} - {None}:
+            self.matches_by_team[team_id].append(match)
+        day = match_day(match)
+        if day:
+            self.matches_by_date[day].append(match)
+        tournament_id = match.get('tournament')
+        self.matches_by_tournament[tournament_id].append(match)
+        self.matches_by_round[(tournament_id, match.get('round'))].append(match)
+
+    def _index_team(self, team):
+        if 'id' in team:
+            self.team_by_id.setdefault(team['id'], team)
+        if team.get('slug'):
+            self.team_by_slug.setdefault(team['slug'], team)
+        for name in [team.get('id'), team.get('slug'), team.get('name')] + list(team.get('aliases', [])):
+            if name:
+                self.team_by_alias.setdefault(alias_key(name), team)
+
+    def add_team(self, team):
+        """Append a team to teams.json data and index it."""
+        self.teams.append(team)
+        self._index_team(team)
+        return team
+
+    def add_match(self, match):
+        """Append a match to matches.json data and index it."""
+        self.matches.append(match)
+        self._index_match(match)
+        return match
+
+    # Lookups
+
+    def match(self, match_id):
+        return self.match_by_id.get(match_id)
+
+    def matches_for_team(self, team_id):
+        return self.matches_by_team.get(team_id, [])
+
+    def matches_on(self, day):
+        """Matches on a local calendar day ('YYYY-MM-DD' or a date)."""
+        return self.matches_by_date.get(day if isinstance(day, str) else day.isoformat(), [])
+
+    def matches_in_tournament(self, tournament_id):
+        return self.matches_by_tournament.get(tournament_id, [])
+
+    def matches_in_round(self, tournament_id, round_name):
+        return self.matches_by_round.get((tournament_id, round_name), [])
+
+    def team(self, key):
+        """Find a team by id, slug, name or alias. Returns None if unknown."""
+        if key is None:
+            return None
+        return self.team_by_id.get(key) or self.team_by_slug.get(key) or self.team_by_alias.get(alias_key(key))
+
+    def tournament(self, tournament_id):
+        return self.tournament_by_id.get(tournament_id)
+
+    def channel(self, name):
+        """Find the canais.json entry for a broadcast channel name, id or alias."""
+        if not name:
+            return None
+        return self.channel_by_id.get(name) or self.channel_by_name.get(name.lower().strip())
+
+
+_cache = {}
+
+
+def load_catalog(data_dir=DATA_DIR, reload=False):
+    """Return the catalog for data_dir, parsing the files only once per process.
+
+    The cached catalog is reused until one of the data files changes on disk.
+    """
+    data_dir = Path(data_dir)
+    signature = []
+    for filename in DATA_FILES.values():
+        try:
+            stat = (data_dir / filename).stat()
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append(None)
+
+    cached = _cache.get(data_dir)
+    if not reload and cached and cached[0] == signature:
+        return cached[1]
+
+    catalog = Catalog.load(data_dir)
+    _cache[data_dir] = (signature, catalog)
+    return catalog
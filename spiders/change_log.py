@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Match Change Log
+Every write of data/matches.json made through write_matches() appends one
+JSON line per changed match to .build/match_changes.jsonl:
+
+    {"ts": "2026-01-18T21:05:00+00:00", "source": "update_scores", "op": "update",
+     "match": "<match id>", "fields": ["score", "status"],
+     "old": {"score": {...}, "status": "scheduled"}, "new": {"score": {...}, "status": "finished"}}
+
+op is "add", "update" or "remove" (old/new is {} for the side that does not
+exist). The log is only ever appended to. Consumers remember the byte offset
+they reached and ask for what came after it:
+
+    changes, offset = read_changes(offset)
+    changed_match_ids(changes)
+
+    python spiders/change_log.py --since 0
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import data_lock
+import json_store
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+BUILD_DIR = BASE_DIR / '.build'
+LOG_FILE = BUILD_DIR / 'match_changes.jsonl'
+
+
+def diff_matches(old_matches, new_matches, source=None, ts=None):
+    """Return the change records that turn old_matches into new_matches (matched by id)."""
+    ts = ts or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    old_by_id = {m['id']: m for m in old_matches if 'id' in m}
+    new_by_id = {m['id']: m for m in new_matches if 'id' in m}
+
+    changes = []
+    for match_id, new in new_by_id.items():
+        old = old_by_id.get(match_id)
+        if old is None:
+            op, fields = 'add', list(new)
+        else:
+            op = 'update'
+            fields = [f for f in new if f not in old or old[f] != new[f]]
+            fields += [f for f in old if f not in new]
+            if not fields:
+                continue
+        changes.append({
+            "ts": ts, "source": source, "op": op, "match": match_id, "fields": fields,
+            "old": {f: old[f] for f in fields if old is not None and f in old},
+            "new": {f: new[f] for f in fields if f in new},
+        })
+    for match_id, old in old_by_id.items():
+        if match_id not in new_by_id:
+            changes.append({"ts": ts, "source": source, "op": 'remove', "match": match_id,
+                            "fields": list(old), "old": old, "new": {}})
+    return changes
+
+
+def append_changes(changes, log_file=LOG_FILE):
+    """Append change records to the log in one write. Returns the new end offset."""
+    log_file = Path(log_file)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    payload = ''.join(json.dumps(c, ensure_ascii=False) + '\n' for c in changes).encode('utf-8')
+    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if payload:
+            os.write(fd, payload)
+            os.fsync(fd)
+        return os.lseek(fd, 0, os.SEEK_END)
+    finally:
+        os.close(fd)
+
+
+def read_changes(offset=0, log_file=LOG_FILE):
+    """Return (changes appended since offset, offset to resume from).
+
+    A trailing line still being written is left for the next call.
+    """
+    log_file = Path(log_file)
+    if not log_file.exists():
+        return [], offset
+    with open(log_file, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    complete = data[:data.rfind(b'\n') + 1]
+    changes = [json.loads(line) for line in complete.decode('utf-8').splitlines() if line.strip()]
+    return changes, offset + len(complete)
+
+
+def changed_match_ids(changes):
+    """Ids of the matches touched by changes, in first-seen order."""
+    return list(dict.fromkeys(c['match'] for c in changes))
+
+
+def write_matches(path, data, source, text=None, expected=None):
+    """Write matches.json through json_store and log what changed.
+
+    text overrides the serialized content (for callers with their own layout).
+    The file is locked while it is compared, written and logged; with expected
+    (a data_lock version) it raises data_lock.ConflictError if the file changed
+    since it was read. Returns (written, changes).
+    """
+    path = Path(path)
+    if text is None:
+        text = json_store.dump_json(data)
+
+    with data_lock.locked(path):
+        data_lock.check(path, expected)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                old_matches = json.load(f).get('matches', [])
+        except (OSError, ValueError):
+            old_matches = []
+
+        if not json_store.write_text(path, text):
+            return False, []
+        data_lock.bump(path)
+
+        changes = diff_matches(old_matches, data.get('matches', []), source)
+        if changes:
+            append_changes(changes)
+    return True, changes
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print match changes logged since a byte offset")
+    parser.add_argument('--since', type=int, default=0, help="byte offset returned by a previous read")
+    args = parser.parse_args()
+
+    changes, offset = read_changes(args.since)
+    for change in changes:
+        print(f"{change['ts']} {change['op']:<6} {change['match']}: {', '.join(change['fields'])}")
+    print(f"[INFO] {len(changes)} changes, next offset: {offset}")
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Compact Match Export
+Writes the browser-facing copy of data/matches.json in two parts:
+
+    data/schedule.<hash>.json   everything but status and score; the name
+                                changes with the content, so it can be cached
+                                for as long as the browser likes
+    data/live.json              {"schedule": "schedule.<hash>.json",
+                                 "matches": [{"id", "status", "score"}, ...]}
+                                small, served with a short TTL
+
+A score update only changes live.json. The previous schedule file is kept
+until the next change, for visitors still holding an older live.json.
+
+The schedule has no whitespace, and repeated values are stored once in
+dictionary tables and referenced by index:
+
+    {"v": 1, "tz": -180, "live": false,
+     "teams": [...], "tournaments": [...], "rounds": [...], "statuses": [...],
+     "venues": [{...}], "broadcasts": [{...}],
+     "fields": [...],
+     "matches": [[id, tournament, home, away, kickoff, round, status,
+                  scoreHome, scoreAway, venue, [broadcast, ...], matchURL, extra?], ...]}
+
+kickoff is epoch seconds; matchDate is rebuilt from it with the "tz" offset
+(minutes). Anything the row cannot represent exactly (other keys, another
+offset, ...) goes into the optional trailing "extra" object, so decoding
+gives back the original matches. data-decoder.js decodes both files in the
+browser.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import json_store
+import page_index
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+LIVE_FILE = DATA_DIR / 'live.json'
+SCHEDULE_PREFIX = 'schedule.'
+
+FORMAT_VERSION = 1
+# Brasília time; matchDate values with another offset keep it in "extra"
+DEFAULT_TZ_MINUTES = -180
+
+FIELDS = ['id', 'tournament', 'homeTeam', 'awayTeam', 'kickoff', 'round', 'status',
+          'scoreHome', 'scoreAway', 'venue', 'broadcasting', 'matchURL']
+ROW_KEYS = {'id', 'tournament', 'homeTeam', 'awayTeam', 'matchDate', 'round', 'status',
+            'score', 'venue', 'broadcasting', 'matchURL'}
+# Kept out of the schedule and published in live.json instead
+LIVE_KEYS = ('status', 'score')
+
+
+class _Table:
+    """Values in first-seen order, looked up by their canonical JSON."""
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def add(self, value):
+        if value is None:
+            return None
+        key = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        if key not in self._index:
+            self._index[key] = len(self.values)
+            self.values.append(value)
+        return self._index[key]
+
+
+def format_match_date(kickoff, tz_minutes):
+    """Rebuild a matchDate string ('2026-01-18T16:00:00-03:00') from epoch seconds."""
+    local = datetime.fromtimestamp(kickoff, timezone(timedelta(minutes=tz_minutes)))
+    return local.isoformat()
+
+
+def _kickoff(match_date):
+    try:
+        return int(datetime.fromisoformat(match_date.replace('Z', '+00:00')).timestamp())
+    except (AttributeError, ValueError):
+        return None
+
+
+def encode_matches(matches, tz_minutes=DEFAULT_TZ_MINUTES, include_live=True):
+    """Return the compact payload for a list of matches.
+
+    With include_live=False, status and score are left out (null columns).
+    """
+    tables = {name: _Table() for name in ('teams', 'tournaments', 'rounds', 'statuses', 'venues', 'broadcasts')}
+    rows = []
+    for match in matches:
+        extra = {key: value for key, value in match.items() if key not in ROW_KEYS}
+        if not include_live:
+            match = {key: value for key, value in match.items() if key not in LIVE_KEYS}
+
+        kickoff = _kickoff(match.get('matchDate'))
+        if 'matchDate' in match and (kickoff is None or
+                                     format_match_date(kickoff, tz_minutes) != match['matchDate']):
+            extra['matchDate'] = match['matchDate']
+
+        score = match.get('score')
+        if isinstance(score, dict) and list(score) == ['home', 'away']:
+            score_home, score_away = score['home'], score['away']
+        else:
+            score_home = score_away = None
+            if 'score' in match:
+                extra['score'] = score
+
+        broadcasting = match.get('broadcasting')
+        if isinstance(broadcasting, list):
+            broadcast_refs = [tables['broadcasts'].add(b) for b in broadcasting]
+        else:
+            broadcast_refs = None
+            if 'broadcasting' in match:
+                extra['broadcasting'] = broadcasting
+
+        # Keys the match does not have at all (rows always hold every field)
+        missing = sorted(ROW_KEYS - set(match) - (set() if include_live else set(LIVE_KEYS)))
+        if missing:
+            extra['$missing'] = missing
+
+        row = [
+            match.get('id'),
+            tables['tournaments'].add(match.get('tournament')),
+            tables['teams'].add(match.get('homeTeam')),
+            tables['teams'].add(match.get('awayTeam')),
+            kickoff,
+            tables['rounds'].add(match.get('round')),
+            tables['statuses'].add(match.get('status')),
+            score_home,
+            score_away,
+            tables['venues'].add(match.get('venue')),
+            broadcast_refs,
+            match.get('matchURL'),
+        ]
+        if extra:
+            row.append(extra)
+        rows.append(row)
+
+    payload = {"v": FORMAT_VERSION, "tz": tz_minutes, "live": include_live}
+    payload.update({name: table.values for name, table in tables.items()})
+    payload["fields"] = FIELDS
+    payload["matches"] = rows
+    return payload
+
+
+def decode_matches(payload):
+    """Inverse of encode_matches (mirrors decodeMatches in data-decoder.js)."""
+    def ref(table, index):
+        return None if index is None else payload[table][index]
+
+    matches = []
+    for row in payload['matches']:
+        (match_id, tournament, home, away, kickoff, round_ref, status,
+         score_home, score_away, venue, broadcasts, match_url) = row[:12]
+        extra = row[12] if len(row) > 12 else {}
+        match = {
+            'id': match_id,
+            'tournament': ref('tournaments', tournament),
+            'homeTeam': ref('teams', home),
+            'awayTeam': ref('teams', away),
+            'matchDate': format_match_date(kickoff, payload['tz']) if kickoff is not None else None,
+            'round': ref('rounds', round_ref),
+            'status': ref('statuses', status),
+            'score': {'home': score_home, 'away': score_away},
+            'venue': ref('venues', venue),
+            'broadcasting': [payload['broadcasts'][i] for i in broadcasts] if broadcasts is not None else None,
+            'matchURL': match_url,
+        }
+        if payload.get('live') is False:
+            for key in LIVE_KEYS:
+                del match[key]
+        for key in extra.get('$missing', []):
+            del match[key]
+        for key, value in extra.items():
+            if key != '$missing':
+                match[key] = value
+        matches.append(match)
+    return matches
+
+
+def live_entries(matches):
+    """The {id, status, score} entries of live.json (keys a match lacks are left out)."""
+    return [dict([('id', match.get('id'))] + [(key, match[key]) for key in LIVE_KEYS if key in match])
+            for match in matches]
+
+
+def merge_live(matches, entries):
+    """Apply live.json entries to decoded schedule matches (mirrors applyLive in data-decoder.js)."""
+    by_id = {entry['id']: entry for entry in entries}
+    for match in matches:
+        entry = by_id.get(match['id'])
+        if entry:
+            match.update((key, entry[key]) for key in LIVE_KEYS if key in entry)
+    return matches
+
+
+def _dumps_compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def schedule_files(data_dir=DATA_DIR):
+    return sorted(Path(data_dir).glob(SCHEDULE_PREFIX + '*.json'))
+
+
+def write_split(matches, data_dir=DATA_DIR):
+    """Write the schedule and live.json for matches. Returns the paths written.
+
+    Raises ValueError if the export would not decode back to matches.
+    """
+    data_dir = Path(data_dir)
+    live_file = data_dir / LIVE_FILE.name
+    schedule_text = _dumps_compact(encode_matches(matches, include_live=False))
+    entries = live_entries(matches)
+    if merge_live(decode_matches(json.loads(schedule_text)), entries) != matches:
+        raise ValueError("schedule/live export does not round-trip; not written")
+
+    digest = hashlib.sha256(schedule_text.encode('utf-8')).hexdigest()[:12]
+    schedule_name = f"{SCHEDULE_PREFIX}{digest}.json"
+
+    try:
+        with open(live_file, 'r', encoding='utf-8') as f:
+            previous_name = json.load(f).get('schedule')
+    except (OSError, ValueError):
+        previous_name = None
+
+    written = []
+    if json_store.write_text(data_dir / schedule_name, schedule_text):
+        written.append(data_dir / schedule_name)
+    # live.json goes last, so it never points at a schedule not yet on disk
+    if json_store.write_text(live_file, _dumps_compact({"schedule": schedule_name, "matches": entries})):
+        written.append(live_file)
+
+    for path in schedule_files(data_dir):
+        if path.name not in (schedule_name, previous_name):
+            for stale in [path] + [path.with_name(path.name + s) for s in page_index.PAGE_SIBLING_SUFFIXES]:
+                if stale.exists():
+                    stale.unlink()
+    return written
+
+
+if __name__ == "__main__":
+    from catalog import load_catalog
+
+    written = write_split(load_catalog(DATA_DIR).matches)
+    for path in written:
+        print(f"[OK] Wrote {path.relative_to(BASE_DIR).as_posix()} ({path.stat().st_size} bytes)")
+    if not written:
+        print("[OK] Schedule and live.json unchanged")
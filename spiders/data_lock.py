@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Shared Data File Locking
+Read-modify-write for the data files several scripts rewrite (matches.json,
+teams.json, teams_data.json) without losing each other's updates.
+
+Every file has an advisory lock (.build/locks/<name>.<id>.lock) and a
+generation counter (<name>.<id>.gen) that is bumped on every write made
+through this module. A read returns the data with its version (generation +
+sha256 of the bytes); a write given that version fails with ConflictError if
+the file changed in between, including edits made by hand:
+
+    data, version = read_json(path)
+    ...
+    write_json(path, data, expected=version)   # raises ConflictError
+
+    update_json(path, mutate)   # re-reads and re-applies mutate on conflict
+
+Locks are held only around the read and the write, never across a whole run,
+so a page build and the score updater can work at the same time.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import json_store
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+LOCK_DIR = BASE_DIR / '.build' / 'locks'
+
+LOCK_TIMEOUT = 30  # seconds to wait for another writer
+RETRIES = 5
+
+
+class ConflictError(Exception):
+    """The file changed since it was read."""
+
+
+def _lock_file(path, suffix):
+    # Named after the file, plus a hash of its full path so equal names in other directories do not share it
+    path = Path(path).resolve()
+    digest = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:8]
+    return LOCK_DIR / f"{path.name}.{digest}{suffix}"
+
+
+def _try_lock(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+
+def _unlock(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def locked(path, timeout=LOCK_TIMEOUT):
+    """Hold the advisory lock of path (not reentrant)."""
+    lock_file = _lock_file(path, '.lock')
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(fd)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"timed out waiting for the lock on {path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def generation(path):
+    """Number of writes made to path through this module."""
+    try:
+        return int(_lock_file(path, '.gen').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return 0
+
+
+def bump(path):
+    """Advance the generation of path (call with the lock held, after writing)."""
+    json_store.write_text(_lock_file(path, '.gen'), str(generation(path) + 1))
+
+
+def _snapshot(path):
+    try:
+        payload = Path(path).read_bytes()
+    except FileNotFoundError:
+        payload = None
+    digest = hashlib.sha256(payload).hexdigest() if payload is not None else None
+    return payload, {"generation": generation(path), "sha256": digest}
+
+
+def current_version(path):
+    """Version of path right now, for a later write(expected=...) by a caller that reads it another way."""
+    with locked(path):
+        return _snapshot(path)[1]
+
+
+def check(path, expected):
+    """Raise ConflictError unless path is still at version expected (call with the lock held)."""
+    if expected is not None and _snapshot(path)[1] != expected:
+        raise ConflictError(f"{path} changed since it was read")
+
+
+def read_json(path, default=None):
+    """Return (data, version). A missing file gives (default, its version)."""
+    with locked(path):
+        payload, version = _snapshot(path)
+    if payload is None:
+        return copy.deepcopy(default), version
+    return json.loads(payload.decode('utf-8')), version
+
+
+def write_text(path, text, expected=None):
+    """Write text if path is still at version expected. Returns False if it was unchanged.
+
+    Raises ConflictError if the file changed since it was read.
+    """
+    with locked(path):
+        check(path, expected)
+        written = json_store.write_text(path, text)
+        if written:
+            bump(path)
+        return written
+
+
+def write_json(path, data, expected=None, indent=2):
+    return write_text(path, json_store.dump_json(data, indent=indent), expected)
+
+
+def update_json(path, mutate, default=None, retries=RETRIES, indent=2):
+    """Read path, let mutate(data) change it in place, write it back.
+
+    On a conflict the file is read again and mutate re-applied, up to retries
+    times. Returns (data, written).
+    """
+    for attempt in range(retries):
+        data, version = read_json(path, default)
+        mutate(data)
+        try:
+            return data, write_json(path, data, expected=version, indent=indent)
+        except ConflictError:
+            if attempt == retries - 1:
+                raise
+            print(f"[INFO] {Path(path).name} changed while updating it, retrying")
+            time.sleep(0.05 * (attempt + 1))
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Deploy Diff Manifest
+Lists exactly which output files changed since the last deploy, so the deploy
+step can upload only those files and purge only their URLs on the CDN.
+
+Watched files: everything under data/, times/ and the match page directories
+(one per tournament, e.g. paulistao26/), including .gz/.br siblings.
+
+    .build/deploy-manifest.json   written after every build:
+        {"added":    [{"path": ..., "sha256": ...}],
+         "modified": [{"path": ..., "sha256": ...}],
+         "deleted":  [{"path": ..., "sha256": <last deployed hash>}],
+         "purge":    [URL paths to invalidate]}
+    .build/deploy_state.json      hashes of the last deployed tree
+
+Changes accumulate across builds until the deploy step confirms the upload:
+
+    python spiders/deploy_manifest.py --mark-deployed
+
+Entries are sorted and carry no timestamps, so the same tree always produces a
+byte-identical manifest.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import json_store
+import page_index
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+BUILD_DIR = BASE_DIR / '.build'
+MANIFEST_FILE = BUILD_DIR / 'deploy-manifest.json'
+STATE_FILE = BUILD_DIR / 'deploy_state.json'
+HASH_CACHE_FILE = BUILD_DIR / 'deploy_hash_cache.json'
+
+WATCHED_DIRS = ['data', 'times']
+
+
+def _load(path):
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def watched_dirs():
+    """data/, times/ and every directory holding generated match pages."""
+    page_dirs = {key.split('/', 1)[0] for key in page_index.list_generated_pages()}
+    return sorted(set(WATCHED_DIRS) | page_dirs)
+
+
+def hash_tree(dirs=None):
+    """Return {relative path: sha256} for every file in the watched directories.
+
+    Hashes are cached by size and mtime; the atomic writer leaves unchanged files
+    untouched, so only rewritten files are read again.
+    """
+    cache = _load(HASH_CACHE_FILE)
+    new_cache = {}
+    hashes = {}
+
+    for directory in dirs or watched_dirs():
+        for root, _, files in os.walk(BASE_DIR / directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = Path(root) / name
+                key = path.relative_to(BASE_DIR).as_posix()
+                stat = path.stat()
+                cached = cache.get(key)
+                if cached and cached[1] == stat.st_size and cached[2] == stat.st_mtime_ns:
+                    digest = cached[0]
+                else:
+                    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+                hashes[key] = digest
+                new_cache[key] = [digest, stat.st_size, stat.st_mtime_ns]
+
+    json_store.write_json(HASH_CACHE_FILE, new_cache, indent=None, sort_keys=True)
+    return hashes
+
+
+def purge_urls(path):
+    """URL paths a CDN must invalidate when path changes."""
+    urls = ['/' + path]
+    for suffix in page_index.PAGE_SIBLING_SUFFIXES:
+        if path.endswith(suffix):
+            # The sibling is served under the URL of the uncompressed file
+            return purge_urls(path[:-len(suffix)])
+    if path.endswith('/index.html'):
+        urls.append('/' + path[:-len('index.html')])
+    return urls
+
+
+def diff_trees(deployed, current):
+    """Compare two {path: sha256} maps. Returns the manifest dict."""
+    added = [{"path": p, "sha256": current[p]} for p in sorted(set(current) - set(deployed))]
+    deleted = [{"path": p, "sha256": deployed[p]} for p in sorted(set(deployed) - set(current))]
+    modified = [{"path": p, "sha256": current[p]} for p in sorted(set(current) & set(deployed))
+                if current[p] != deployed[p]]
+
+    purge = set()
+    for entry in modified + deleted:
+        purge.update(purge_urls(entry['path']))
+
+    return {"added": added, "modified": modified, "deleted": deleted, "purge": sorted(purge)}
+
+
+def write_deploy_manifest():
+    """Diff the watched files against the last deployed state and save the manifest."""
+    manifest = diff_trees(_load(STATE_FILE), hash_tree())
+    json_store.write_json(MANIFEST_FILE, manifest)
+    return manifest
+
+
+def mark_deployed():
+    """Record the current tree as deployed; the next manifest starts empty."""
+    current = hash_tree()
+    json_store.write_json(STATE_FILE, current, indent=None, sort_keys=True)
+    json_store.write_json(MANIFEST_FILE, diff_trees(current, current))
+    return len(current)
+
+
+def summary(manifest):
+    return (f"added {len(manifest['added'])}, modified {len(manifest['modified'])}, "
+            f"deleted {len(manifest['deleted'])}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List the output files changed since the last deploy")
+    parser.add_argument('--mark-deployed', action='store_true',
+                        help="record the current files as deployed")
+    args = parser.parse_args()
+
+    if args.mark_deployed:
+        print(f"[OK] Marked {mark_deployed()} files as deployed")
+    else:
+        manifest = write_deploy_manifest()
+        print(f"[OK] Deploy manifest: {summary(manifest)}")
+        print(f"[INFO] Saved to: {MANIFEST_FILE}")
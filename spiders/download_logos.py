@@ -2,11 +2,12 @@
 """Logo Downloader for Onde Vai Passar Futebol Hoje"""
 
 import os
-import json
 import requests
 from pathlib import Path
 import time
 
+from catalog import load_catalog
+
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 ASSETS_DIR = BASE_DIR / 'assets'
@@ -62,10 +63,7 @@ def load_teams_from_json():
         print("[WARN] teams.json not found at: " + str(teams_json_path))
         return []
 
-    with open(teams_json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    return data.get('teams', [])
+    return load_catalog(DATA_DIR).teams
 
 # League Information
 CAMPEONATOS = {
@@ -1,123 +1,323 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
+import argparse
+import hashlib
+import html
 import json
 import os
 from pathlib import Path
 from datetime import datetime
-import re
+import sys
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import change_log
+import compact_export
+import data_lock
+import deploy_manifest
+import json_store
+import page_index
+import precompress
+import shards
+from catalog import CHANNEL_ALIASES, load_catalog
+from team_resolver import slugify
+from page_template import PageTemplate, relative_root
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'data'
 
-def slugify(text):
-    text = text.lower()
-    text = text.replace('ã', 'a').replace('á', 'a').replace('â', 'a')
-    text = text.replace('é', 'e').replace('ê', 'e')
-    text = text.replace('í', 'i')
-    text = text.replace('ó', 'o').replace('õ', 'o').replace('ô', 'o')
-    text = text.replace('ú', 'u')
-    text = text.replace('ç', 'c')
-    text = re.sub(r'[^a-z0-9]+', '-', text)
-    text = text.strip('-')
-    return text
+# Bump when the page rendering logic changes so every page is rebuilt once
+MANIFEST_VERSION = 1
+
+def hash_content(data):
+    """Return the sha256 hex digest of a JSON-serializable object or a string."""
+    if not isinstance(data, str):
+        data = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
 
 def load_data():
-    with open(DATA_DIR / 'matches.json', 'r', encoding='utf-8') as f:
-        matches = json.load(f)['matches']
-    with open(DATA_DIR / 'teams.json', 'r', encoding='utf-8') as f:
-        teams = {t['id']: t for t in json.load(f)['teams']}
-    with open(DATA_DIR / 'tournaments.json', 'r', encoding='utf-8') as f:
-        tournaments = {t['id']: t for t in json.load(f)['tournaments']}
-    with open(DATA_DIR / 'canais.json', 'r', encoding='utf-8') as f:
-        canais = json.load(f)['canais']
-    return matches, teams, tournaments, canais
-
-def generate_match_pages():
+    catalog = load_catalog(DATA_DIR)
+    return catalog.matches, catalog.team_by_id, catalog.tournament_by_id, catalog.canais
+
+def assign_match_url(match, teams):
+    """Set match['matchURL'] and return the directory of the match page."""
+    home_team = teams.get(match['homeTeam'], {'name': match['homeTeam']})
+    away_team = teams.get(match['awayTeam'], {'name': match['awayTeam']})
+
+    match_date = datetime.fromisoformat(match['matchDate'].replace('Z', '+00:00'))
+    date_slug = match_date.strftime('%d-%m-%Y')
+    teams_slug = f"{slugify(home_team['name'])}-vs-{slugify(away_team['name'])}"
+
+    # URL and Path
+    relative_url = f"/{match['tournament']}/{date_slug}/{teams_slug}/"
+    match['matchURL'] = relative_url
+
+    return BASE_DIR / match['tournament'] / date_slug / teams_slug
+
+def index_catalogs(teams, tournaments, canais):
+    """Index every catalog entry by id and slug, the keys match pages look them up by."""
+    def by_id_and_slug(items):
+        index = {}
+        for item in items:
+            for key in (item.get('slug'), item.get('id')):
+                if key is not None:
+                    index.setdefault(key, item)
+        return index
+
+    return {
+        'teams': by_id_and_slug(teams.values()),
+        'tournaments': by_id_and_slug(tournaments.values()),
+        'canais': by_id_and_slug(canais),
+    }
+
+def select_match_catalogs(match, catalog_index):
+    """Return only the teams, tournament and channels a match page looks up."""
+    def pick(index, refs):
+        selected = []
+        for ref in refs:
+            item = index.get(ref)
+            if item is not None and all(item is not s for s in selected):
+                selected.append(item)
+        return selected
+
+    channel_refs = []
+    for broadcast in match.get('broadcasting', []):
+        canonical_id = CHANNEL_ALIASES.get(broadcast.get('channel', '').lower().strip())
+        if canonical_id and canonical_id not in channel_refs:
+            channel_refs.append(canonical_id)
+
+    return (pick(catalog_index['teams'], [match['homeTeam'], match['awayTeam']]),
+            pick(catalog_index['tournaments'], [match['tournament']]),
+            pick(catalog_index['canais'], channel_refs))
+
+def catalog_script(page_teams, page_tournaments, page_canais):
+    """Serialize the catalogs a match page embeds as window.STATIC_* assignments."""
+    catalog_js = "  window.STATIC_TEAMS_DATA = " + json.dumps(page_teams, ensure_ascii=False) + ";\n"
+    catalog_js += "  window.STATIC_TOURNAMENTS_DATA = " + json.dumps(page_tournaments, ensure_ascii=False) + ";\n"
+    catalog_js += "  window.STATIC_CANAIS_DATA = " + json.dumps(page_canais, ensure_ascii=False) + ";\n"
+    return catalog_js
+
+def render_match_page(match, page_template, teams, tournaments, catalog_js, root):
+    """Render the HTML of one match page around the catalog_script output.
+
+    root is the relative path from the page directory back to the site root.
+    """
+    home_team = teams.get(match['homeTeam'], {'name': match['homeTeam']})
+    away_team = teams.get(match['awayTeam'], {'name': match['awayTeam']})
+    tournament = tournaments.get(match['tournament'], {'name': match['tournament']})
+
+    # Prepare static data injection (using simple string concat to avoid f-string brace issues)
+    static_data_js = "\n<script>\n"
+    static_data_js += "  window.STATIC_MATCH_DATA = " + json.dumps(match, ensure_ascii=False) + ";\n"
+    static_data_js += catalog_js
+    static_data_js += "</script>\n"
+
+    home_name = home_team.get('name', match['homeTeam'])
+    away_name = away_team.get('name', match['awayTeam'])
+    tournament_name = tournament.get('name', match['tournament'])
+
+    title_text = f"{home_name} x {away_name} - {tournament_name} | Onde Vai Passar"
+    description_text = f"Onde assistir {home_name} x {away_name} ao vivo. Veja horários, canais de transmissão e detalhes do jogo."
+
+    # Inject data and SEO tags, and point relative paths back to the site root
+    return page_template.render(
+        head=static_data_js,
+        title=html.escape(title_text, quote=False),
+        description=html.escape(description_text),
+        root=root,
+    )
+
+# Per-process render state, set once by _init_worker in --workers mode
+_worker_state = {}
+
+def _init_worker(template, teams, tournaments, canais, slim=False):
+    # The template is compiled once; the full catalogs are identical on every page, so they are serialized once too
+    catalog_js = None if slim else catalog_script(list(teams.values()), list(tournaments.values()), canais)
+    _worker_state.update(template=PageTemplate(template), teams=teams, tournaments=tournaments, catalog_js=catalog_js,
+                         catalog_index=index_catalogs(teams, tournaments, canais) if slim else None)
+
+def write_match_page(job):
+    """Render and write one page. Returns None on success, or (error, traceback) on failure."""
+    match, page_file = job
+    try:
+        teams, tournaments = _worker_state['teams'], _worker_state['tournaments']
+        catalog_js = _worker_state['catalog_js']
+        if catalog_js is None:
+            catalog_js = catalog_script(*select_match_catalogs(match, _worker_state['catalog_index']))
+        page_content = render_match_page(match, _worker_state['template'], teams, tournaments, catalog_js,
+                                         relative_root(page_file.parent, BASE_DIR))
+        json_store.write_text(page_file, page_content)
+        return None
+    except Exception as e:
+        return str(e), traceback.format_exc()
+
+def write_match_pages(jobs, template, teams, tournaments, canais, workers=1, slim=False):
+    """Yield the result of write_match_page for every job, in job order."""
+    if workers <= 1 or len(jobs) < 2:
+        _init_worker(template, teams, tournaments, canais, slim)
+        for job in jobs:
+            yield write_match_page(job)
+        return
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(template, teams, tournaments, canais, slim)) as executor:
+        yield from executor.map(write_match_page, jobs, chunksize=chunksize)
+
+def generate_match_pages(force=False, workers=1, slim=False, compress=True, match_ids=None, with_brotli=False):
+    """Build the match pages and the files derived from matches.json.
+
+    With match_ids, only the pages of those matches are checked and rebuilt;
+    every other page keeps its manifest entry (used by update_scores).
+    If matches.json is changed by another script during the build, the build
+    runs again on the new content (unchanged pages are skipped by hash).
+    """
+    for attempt in range(data_lock.RETRIES):
+        try:
+            return _generate_match_pages(force, workers, slim, compress, match_ids, with_brotli)
+        except data_lock.ConflictError:
+            if attempt == data_lock.RETRIES - 1:
+                raise
+            print("matches.json foi alterado durante a geração; gerando de novo.")
+
+def _generate_match_pages(force, workers, slim, compress, match_ids, with_brotli):
+    # Read before the data, so a change made after it is never missed
+    matches_version = data_lock.current_version(DATA_DIR / 'matches.json')
     matches, teams, tournaments, canais = load_data()
+    targeted = match_ids is not None
+    match_ids = set(match_ids or ())
     
     # Load template
     with open(BASE_DIR / 'match.html', 'r', encoding='utf-8') as f:
         template = f.read()
 
+    # Every page embeds the template and, unless slim, the full catalogs
+    shared_inputs = {"version": MANIFEST_VERSION, "template": hash_content(template), "slim": slim}
+    if not slim:
+        shared_inputs.update(teams=list(teams.values()), tournaments=list(tournaments.values()), canais=canais)
+    shared_hash = hash_content(shared_inputs)
+    catalog_index = index_catalogs(teams, tournaments, canais) if slim else None
+    manifest = page_index.load_manifest()
+    owned_paths = set(page_index.list_generated_pages(manifest))
+    if not manifest['pages']:
+        # First indexed build: adopt the pages already on disk so stale ones get pruned
+        owned_paths.update(page_index.scan_pages(set(tournaments) | {m.get('tournament', '') for m in matches}))
+    # Hashes from another renderer version (or --force) never match
+    previous_pages = manifest['pages'] if manifest.get('version') == MANIFEST_VERSION and not force else {}
+    pages = {}
+
     total_created = 0
+    total_skipped = 0
     updated_matches = []
+    jobs = []
+    written_pages = []
     
     for match in matches:
         try:
-            home_team = teams.get(match['homeTeam'], {'name': match['homeTeam']})
-            away_team = teams.get(match['awayTeam'], {'name': match['awayTeam']})
-            tournament = tournaments.get(match['tournament'], {'name': match['tournament']})
-            
-            match_date = datetime.fromisoformat(match['matchDate'].replace('Z', '+00:00'))
-            date_slug = match_date.strftime('%d-%m-%Y')
-            teams_slug = f"{slugify(home_team['name'])}-vs-{slugify(away_team['name'])}"
-            
-            # URL and Path
-            relative_url = f"/{match['tournament']}/{date_slug}/{teams_slug}/"
-            match['matchURL'] = relative_url
+            path = assign_match_url(match, teams)
             updated_matches.append(match)
-            
-            path = BASE_DIR / match['tournament'] / date_slug / teams_slug
-            path.mkdir(parents=True, exist_ok=True)
-            
-            # Prepare static data injection (using simple string concat to avoid f-string brace issues)
-            static_data_js = "\n<script>\n"
-            static_data_js += "  window.STATIC_MATCH_DATA = " + json.dumps(match, ensure_ascii=False) + ";\n"
-            static_data_js += "  window.STATIC_TEAMS_DATA = " + json.dumps(list(teams.values()), ensure_ascii=False) + ";\n"
-            static_data_js += "  window.STATIC_TOURNAMENTS_DATA = " + json.dumps(list(tournaments.values()), ensure_ascii=False) + ";\n"
-            static_data_js += "  window.STATIC_CANAIS_DATA = " + json.dumps(canais, ensure_ascii=False) + ";\n"
-            static_data_js += "</script>\n"
-            
-            # Inject data and SEO tags
-            page_content = template.replace('</head>', static_data_js + "</head>")
-            
-            home_name = home_team.get('name', match['homeTeam'])
-            away_name = away_team.get('name', match['awayTeam'])
-            tournament_name = tournament.get('name', match['tournament'])
-            
-            title_text = f"{home_name} x {away_name} - {tournament_name} | Onde Vai Passar"
-            description_text = f"Onde assistir {home_name} x {away_name} ao vivo. Veja horários, canais de transmissão e detalhes do jogo."
-            
-            # Replace title/meta
-            page_content = re.sub(r'(<title id="page-title">)(.*?)(</title>)', rf'\1{title_text}\3', page_content)
-            if 'id="page-title"' not in page_content:
-                page_content = re.sub(r'(<title>)(.*?)(</title>)', rf'<title id="page-title">{title_text}</title>', page_content)
-            
-            page_content = re.sub(r'<meta\s+name="description"[^>]*content=".*?"[^>]*>', 
-                                 f'<meta name="description" id="page-description" content="{description_text}">', 
-                                 page_content)
-
-            # Fix relative paths
-            page_content = page_content.replace('href="styles.css"', 'href="../../../styles.css"')
-            page_content = page_content.replace('src="router.js"', 'src="../../../router.js"')
-            page_content = page_content.replace('href="index.html"', 'href="../../../index.html"')
-            page_content = page_content.replace('href="campeonatos.html"', 'href="../../../campeonatos.html"')
-            page_content = page_content.replace('href="sobre.html"', 'href="../../../sobre.html"')
-            page_content = page_content.replace('href="contato.html"', 'href="../../../contato.html"')
-            page_content = page_content.replace('href="privacidade.html"', 'href="../../../privacidade.html"')
-            page_content = page_content.replace('src="assets/root/logo_8_original_name.png"', 'src="../../../assets/root/logo_8_original_name.png"')
-            # Fix canais.json fetch path
-            page_content = page_content.replace("fetch('/data/canais.json')", "fetch('../../../data/canais.json')")
-            
-            with open(path / 'index.html', 'w', encoding='utf-8') as f:
-                f.write(page_content)
-            
-            total_created += 1
-            if total_created % 20 == 0:
-                print(f"Generated {total_created} pages...")
+
+            if targeted and match['id'] not in match_ids and match['id'] in manifest['pages']:
+                pages[match['id']] = manifest['pages'][match['id']]
+                total_skipped += 1
+                continue
+
+            page_file = path / 'index.html'
+            page_key = page_file.relative_to(BASE_DIR).as_posix()
+            page_inputs = [match]
+            if slim:
+                page_inputs.append(select_match_catalogs(match, catalog_index))
+            input_hash = hash_content(shared_hash + hash_content(page_inputs))
+            previous = previous_pages.get(match['id'])
+            pages[match['id']] = {"path": page_key, "hash": input_hash}
+
+            if previous == pages[match['id']] and page_file.exists():
+                total_skipped += 1
+                continue
+
+            jobs.append((match, page_file))
                 
         except Exception as e:
             print(f"Error processing match {match.get('id', 'N/A')}: {e}")
             traceback.print_exc()
+            # Keep its page for now rather than pruning it over a transient error
+            if match.get('id') in manifest['pages']:
+                pages[match['id']] = manifest['pages'][match['id']]
+
+    results = write_match_pages(jobs, template, teams, tournaments, canais, workers=workers, slim=slim)
+    for (match, page_file), error in zip(jobs, results):
+        if error:
+            message, trace = error
+            print(f"Error processing match {match.get('id', 'N/A')}: {message}")
+            print(trace, end='', file=sys.stderr)
+            # Keep the previous entry (or none) so the next run retries it
+            if match['id'] in manifest['pages']:
+                pages[match['id']] = manifest['pages'][match['id']]
+            else:
+                pages.pop(match['id'], None)
+            continue
+
+        total_created += 1
+        written_pages.append(page_file)
+        if total_created % 20 == 0:
+            print(f"Generated {total_created} pages...")
+
+    # Save updated matches.json (left untouched when no matchURL changed)
+    matches_changed, _ = change_log.write_matches(DATA_DIR / 'matches.json', {"matches": updated_matches},
+                                                  "generate_match_pages", expected=matches_version)
+    shards_written, _, shards_removed = shards.write_shards(updated_matches, teams)
+    split_written = compact_export.write_split(updated_matches)
 
-    # Save updated matches.json
-    with open(DATA_DIR / 'matches.json', 'w', encoding='utf-8') as f:
-        json.dump({"matches": updated_matches}, f, ensure_ascii=False, indent=2)
+    new_manifest = {"version": MANIFEST_VERSION, "pages": pages}
+    page_index.save_manifest(new_manifest)
+
+    # Remove pages no match points to anymore (e.g. rescheduled matches)
+    removed_pages = page_index.prune_pages(owned_paths - set(page_index.list_generated_pages(new_manifest)))
     
     print(f"\nFinalizado! Total de páginas geradas: {total_created}")
-    print("matches.json atualizado com matchURL.")
+    print(f"Páginas sem alteração (ignoradas): {total_skipped}")
+    print(f"Páginas antigas removidas: {len(removed_pages)}")
+    for removed in removed_pages:
+        print(f"  - {removed}")
+    if matches_changed:
+        print("matches.json atualizado com matchURL.")
+    else:
+        print("matches.json sem alterações.")
+    print(f"Arquivos por data/campeonato/time atualizados: {len(shards_written)} (removidos: {len(shards_removed)})")
+    print(f"Arquivos schedule/live.json atualizados: {len(split_written)}")
+
+    if compress:
+        if targeted:
+            # Only what this run (or the caller, for matches.json) wrote; unchanged files are skipped by hash
+            written = written_pages + shards_written + split_written + [DATA_DIR / 'matches.json']
+            compressed, unchanged, removed = precompress.precompress(written, workers=workers,
+                                                                     with_brotli=with_brotli)
+        else:
+            compressed, unchanged, removed = precompress.precompress(workers=workers, with_brotli=with_brotli)
+        print(f"Arquivos comprimidos atualizados: {compressed} (sem alteração: {unchanged}, removidos: {removed})")
+
+    manifest = deploy_manifest.write_deploy_manifest()
+    print(f"Manifesto de deploy: {deploy_manifest.summary(manifest)}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate static match pages from data/matches.json")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the build manifest and rebuild every page")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="render pages in N processes (0 = one per CPU core)")
+    parser.add_argument('--slim-data', action='store_true',
+                        help="embed only the teams, tournament and channels each match uses")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="skip writing the .gz siblings of changed files")
+    parser.add_argument('--brotli', action='store_true',
+                        help="also write .br siblings (only useful behind nginx with ngx_brotli)")
+    parser.add_argument('--only', nargs='+', metavar='MATCH_ID',
+                        help="only check and rebuild the pages of these match ids")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    generate_match_pages()
+    args = parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    generate_match_pages(force=args.force, workers=workers, slim=args.slim_data, compress=not args.no_compress,
+                         match_ids=args.only, with_brotli=args.brotli)
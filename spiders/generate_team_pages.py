@@ -8,8 +8,13 @@ import requests
 from bs4 import BeautifulSoup
 from pathlib import Path
 import time
-import re
-import json
+
+import data_lock
+import deploy_manifest
+import precompress
+from catalog import Catalog, load_catalog
+from page_template import PageTemplate, relative_root
+from team_resolver import resolve_team, slugify
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
@@ -44,47 +49,29 @@ TEAMS = {
 
 LEAGUES = ["brasileiro26"]
 
-def slugify(text):
-    """Convert team name to URL-friendly slug"""
-    text = text.lower()
-    text = text.replace('ã', 'a').replace('á', 'a').replace('â', 'a')
-    text = text.replace('é', 'e').replace('ê', 'e')
-    text = text.replace('í', 'i')
-    text = text.replace('ó', 'o').replace('õ', 'o').replace('ô', 'o')
-    text = text.replace('ú', 'u')
-    text = text.replace('ç', 'c')
-    text = re.sub(r'[^a-z0-9]+', '-', text)
-    text = text.strip('-')
-    return text
-
 def load_teams_json():
-    """Load existing teams from data/teams.json"""
-    teams_json_path = DATA_DIR / 'teams.json'
-    if not teams_json_path.exists():
-        return {"teams": []}
+    """Load existing teams from data/teams.json, indexed by catalog.py"""
+    return load_catalog(DATA_DIR)
 
-    with open(teams_json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def update_teams_json(mutate):
+    """Apply mutate(teams_data) to data/teams.json and save it.
 
-def save_teams_json(data):
-    """Save teams data to data/teams.json"""
+    Goes through data_lock, so a concurrent change to teams.json is read
+    again and mutate re-applied instead of being overwritten.
+    """
     teams_json_path = DATA_DIR / 'teams.json'
-    with open(teams_json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    data, _ = data_lock.update_json(teams_json_path, mutate, default={"teams": []})
     print("[OK] Updated teams.json with " + str(len(data.get('teams', []))) + " teams")
 
-def get_team_by_id(teams_data, team_id):
-    """Find a team by ID in the teams list"""
-    for team in teams_data.get('teams', []):
-        if team.get('id') == team_id:
-            return team
-    return None
+def get_team_by_id(catalog, team_id):
+    """Find a team by ID in the catalog"""
+    return catalog.team_by_id.get(team_id)
 
-def add_or_update_team(teams_data, team_info, tournaments_to_add):
+def add_or_update_team(catalog, team_info, tournaments_to_add):
     """Add a new team or update existing team's tournaments
 
     Args:
-        teams_data: The teams.json data structure
+        catalog: The loaded data catalog (teams.json)
         team_info: Team information dict
         tournaments_to_add: List of tournament IDs to add
 
@@ -92,7 +79,7 @@ def add_or_update_team(teams_data, team_info, tournaments_to_add):
         tuple: (is_new_team, tournaments_added)
     """
     team_id = team_info.get('id')
-    existing_team = get_team_by_id(teams_data, team_id)
+    existing_team = get_team_by_id(catalog, team_id)
 
     if existing_team:
         # Update tournaments if not already present
@@ -118,7 +105,7 @@ def add_or_update_team(teams_data, team_info, tournaments_to_add):
                 "secondary": "#FFFFFF"
             }
         }
-        teams_data['teams'].append(new_team)
+        catalog.add_team(new_team)
         return True, tournaments_to_add  # New team added
 
 def extract_teams_from_league(url, league_name):
@@ -164,35 +151,22 @@ def extract_teams_from_league(url, league_name):
         print("[ERROR] Failed to extract teams from " + league_name + ": " + str(e))
         return {}
 
-def create_team_page(team_data, league_name):
-    """Create an HTML page for a team"""
-    team_name = team_data['name']
-    wiki_url = team_data.get('wiki_url', '')
-    
-    slug = slugify(team_name)
-    filepath = TEAMS_DIR / (slug + ".html")
-    
-    # Skip if page already exists
-    if filepath.exists():
-        print("[SKIP] Page already exists: " + slug + ".html")
-        return False
-    
-    # Create HTML content
-    html_content = """<!DOCTYPE html>
+# Team page template, compiled once; relative paths are written from the site root
+TEAM_PAGE_TEMPLATE = PageTemplate("""<!DOCTYPE html>
 <html lang="pt-BR">
-<!-- Wikipedia Source: {wiki_url} -->
-<!-- Team Data: {{"name": "{team_name}", "league": "{league_name}", "slug": "{slug}"}} -->
+<!-- Wikipedia Source: {{wiki_url}} -->
+<!-- Team Data: {"name": "{{team_name}}", "league": "{{league_name}}", "slug": "{{slug}}"} -->
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
   
   <!-- SEO Meta Tags -->
-  <title>{team_name} - Jogos, Escalação e Onde Assistir | Onde Vai Passar Futebol Hoje</title>
-  <meta name="description" content="Veja todos os jogos do {team_name}, escalações, estatísticas e onde assistir ao vivo. Acompanhe o {team_name} no {league_name}.">
-  <meta name="keywords" content="{team_name}, {team_name} jogos, {team_name} onde assistir, {team_name} escalação, {league_name}">
+  <title>{{team_name}} - Jogos, Escalação e Onde Assistir | Onde Vai Passar Futebol Hoje</title>
+  <meta name="description" content="Veja todos os jogos do {{team_name}}, escalações, estatísticas e onde assistir ao vivo. Acompanhe o {{team_name}} no {{league_name}}.">
+  <meta name="keywords" content="{{team_name}}, {{team_name}} jogos, {{team_name}} onde assistir, {{team_name}} escalação, {{league_name}}">
   
   <!-- Favicon -->
-  <link rel="icon" type="image/png" href="../assets/favicon.png">
+  <link rel="icon" type="image/png" href="assets/favicon.png">
   
   <!-- Google Fonts -->
   <link rel="preconnect" href="https://fonts.googleapis.com">
@@ -200,7 +174,7 @@ def create_team_page(team_data, league_name):
   <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap" rel="stylesheet">
   
   <!-- Stylesheet -->
-  <link rel="stylesheet" href="../styles.css">
+  <link rel="stylesheet" href="styles.css">
 </head>
 <body>
   
@@ -210,7 +184,7 @@ def create_team_page(team_data, league_name):
       <div class="header-content">
         <div class="header-top">
           <h1 class="logo">
-            <a href="../index.html" style="color: inherit;">⚽ Futebol Hoje</a>
+            <a href="index.html" style="color: inherit;">⚽ Futebol Hoje</a>
           </h1>
         </div>
       </div>
@@ -222,17 +196,17 @@ def create_team_page(team_data, league_name):
     
     <!-- Breadcrumb -->
     <nav class="breadcrumb" aria-label="Breadcrumb" style="padding: 1rem 0; font-size: 0.875rem; color: #BDBDBD;">
-      <a href="../index.html" style="color: #FFD700;">Início</a>
+      <a href="index.html" style="color: #FFD700;">Início</a>
       <span style="margin: 0 0.5rem;">›</span>
-      <a href="../campeonatos.html" style="color: #FFD700;">Campeonatos</a>
+      <a href="campeonatos.html" style="color: #FFD700;">Campeonatos</a>
       <span style="margin: 0 0.5rem;">›</span>
-      <span>{team_name}</span>
+      <span>{{team_name}}</span>
     </nav>
     
     <!-- Team Hero -->
     <div style="background: linear-gradient(135deg, rgba(0, 26, 51, 0.9), rgba(0, 8, 20, 0.9)); border: 2px solid #FFD700; border-radius: 16px; padding: 2rem; margin-bottom: 2rem; text-align: center;">
-      <h1 style="font-size: 2.25rem; color: #F2FF00; margin-bottom: 1rem;">{team_name}</h1>
-      <p style="color: #BDBDBD; font-size: 1.125rem;">{league_name}</p>
+      <h1 style="font-size: 2.25rem; color: #F2FF00; margin-bottom: 1rem;">{{team_name}}</h1>
+      <p style="color: #BDBDBD; font-size: 1.125rem;">{{league_name}}</p>
     </div>
     
     <!-- Próximos Jogos -->
@@ -242,8 +216,8 @@ def create_team_page(team_data, league_name):
         Próximos Jogos
       </h2>
       <div style="background: rgba(0, 26, 51, 0.6); border: 1px solid #424242; border-radius: 12px; padding: 1.5rem; text-align: center; color: #BDBDBD;">
-        <p>Informações sobre os próximos jogos do {team_name} serão exibidas aqui.</p>
-        <p style="margin-top: 1rem;"><a href="../index.html" style="color: #FFD700;">Ver todos os jogos de hoje</a></p>
+        <p>Informações sobre os próximos jogos do {{team_name}} serão exibidas aqui.</p>
+        <p style="margin-top: 1rem;"><a href="index.html" style="color: #FFD700;">Ver todos os jogos de hoje</a></p>
       </div>
     </section>
     
@@ -254,7 +228,7 @@ def create_team_page(team_data, league_name):
         Últimos Resultados
       </h2>
       <div style="background: rgba(0, 26, 51, 0.6); border: 1px solid #424242; border-radius: 12px; padding: 1.5rem; text-align: center; color: #BDBDBD;">
-        <p>Resultados recentes do {team_name} serão exibidos aqui.</p>
+        <p>Resultados recentes do {{team_name}} serão exibidos aqui.</p>
       </div>
     </section>
     
@@ -262,11 +236,11 @@ def create_team_page(team_data, league_name):
     <section style="margin-bottom: 2rem;">
       <h2 style="color: #F2FF00; margin-bottom: 1.5rem; display: flex; align-items: center; gap: 0.75rem;">
         <span style="width: 4px; height: 32px; background: #FFD700; border-radius: 4px;"></span>
-        Sobre o {team_name}
+        Sobre o {{team_name}}
       </h2>
       <div style="background: rgba(0, 26, 51, 0.6); border: 1px solid #424242; border-radius: 12px; padding: 1.5rem; color: #E0E0E0; line-height: 1.8;">
-        <p>O <strong>{team_name}</strong> é um dos times participantes do <strong>{league_name}</strong>.</p>
-        <p style="margin-top: 1rem;">Acompanhe todos os jogos, escalações e informações sobre onde assistir o {team_name} ao vivo.</p>
+        <p>O <strong>{{team_name}}</strong> é um dos times participantes do <strong>{{league_name}}</strong>.</p>
+        <p style="margin-top: 1rem;">Acompanhe todos os jogos, escalações e informações sobre onde assistir o {{team_name}} ao vivo.</p>
       </div>
     </section>
     
@@ -281,7 +255,25 @@ def create_team_page(team_data, league_name):
 
 </body>
 </html>
-""".format(team_name=team_name, league_name=league_name, slug=slug, wiki_url=wiki_url)
+""")
+
+def create_team_page(team_data, league_name):
+    """Create an HTML page for a team"""
+    team_name = team_data['name']
+    wiki_url = team_data.get('wiki_url', '')
+    
+    slug = slugify(team_name)
+    filepath = TEAMS_DIR / (slug + ".html")
+    
+    # Skip if page already exists
+    if filepath.exists():
+        print("[SKIP] Page already exists: " + slug + ".html")
+        return False
+    
+    # Create HTML content
+    html_content = TEAM_PAGE_TEMPLATE.render(
+        team_name=team_name, league_name=league_name, slug=slug, wiki_url=wiki_url,
+        root=relative_root(TEAMS_DIR, BASE_DIR))
     
     # Write file
     with open(filepath, 'w', encoding='utf-8') as f:
@@ -298,16 +290,15 @@ def generate_all_team_pages():
     print()
 
     # Load existing teams.json
-    teams_json_data = load_teams_json()
-    print("[INFO] Loaded " + str(len(teams_json_data.get('teams', []))) + " existing teams from teams.json")
+    catalog = load_teams_json()
+    print("[INFO] Loaded " + str(len(catalog.teams)) + " existing teams from teams.json")
     print("[INFO] Processing " + str(len(TEAMS)) + " teams from TEAMS dictionary")
     print("-" * 60)
 
     all_teams = {}
+    team_infos = []
     total_created = 0
     total_skipped = 0
-    new_teams_added = 0
-    tournaments_updated = 0
 
     # Iterate over TEAMS dictionary directly
     for team_name, wiki_url in TEAMS.items():
@@ -325,8 +316,8 @@ def generate_all_team_pages():
         # Store team info
         all_teams[team_name] = {'leagues': LEAGUES, 'wiki_url': wiki_url}
 
-        # Prepare team info for teams.json
-        team_id = slugify(team_name)
+        # Prepare team info for teams.json (existing teams keep their id)
+        team_id = resolve_team(team_name)
         team_info = {
             'id': team_id,
             'name': team_name,
@@ -336,39 +327,57 @@ def generate_all_team_pages():
             'founded': 0
         }
 
-        # Add or update team in teams.json with all LEAGUES
-        is_new, added_tournaments = add_or_update_team(teams_json_data, team_info, LEAGUES)
-        if is_new:
-            new_teams_added += 1
-            print("[NEW] Added to teams.json: " + team_name)
-        elif added_tournaments:
-            tournaments_updated += 1
-            print("[UPDATE] Added tournaments " + str(added_tournaments) + " to: " + team_name)
+        team_infos.append(team_info)
 
         time.sleep(0.5)  # Small delay
 
+    stats = {}
+
+    def apply_teams(teams_data):
+        # Add or update every team in teams.json with all LEAGUES
+        teams_catalog = Catalog(teams_data=teams_data)
+        stats.update(new=0, updated=0)
+        for team_info in team_infos:
+            is_new, added_tournaments = add_or_update_team(teams_catalog, team_info, LEAGUES)
+            if is_new:
+                stats['new'] += 1
+                print("[NEW] Added to teams.json: " + team_info['name'])
+            elif added_tournaments:
+                stats['updated'] += 1
+                print("[UPDATE] Added tournaments " + str(added_tournaments) + " to: " + team_info['name'])
+
+    # Save updated teams.json
+    update_teams_json(apply_teams)
+
     print("\n" + "=" * 60)
     print("[SUCCESS] Team page generation complete!")
     print("[STATS] Created: " + str(total_created) + " pages")
     print("[STATS] Skipped: " + str(total_skipped) + " pages (already exist)")
-    print("[STATS] New teams added to teams.json: " + str(new_teams_added))
-    print("[STATS] Existing teams with tournaments updated: " + str(tournaments_updated))
+    print("[STATS] New teams added to teams.json: " + str(stats['new']))
+    print("[STATS] Existing teams with tournaments updated: " + str(stats['updated']))
     print("[INFO] Leagues applied: " + str(LEAGUES))
     print("[INFO] Pages saved to: " + str(TEAMS_DIR))
     print("=" * 60)
 
-    # Save updated teams.json
-    save_teams_json(teams_json_data)
-
-    # Save basic team data to JSON (legacy format)
+    # Save basic team data to JSON (legacy format), keeping what scrape_team_details added
     json_path = DATA_DIR / 'teams_data.json'
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(all_teams, f, ensure_ascii=False, indent=2)
+    def merge_team_data(data):
+        for team_name, info in all_teams.items():
+            data.setdefault(team_name, {}).update(info)
+    data_lock.update_json(json_path, merge_team_data, default={})
     print("[OK] Saved team data to: " + str(json_path))
 
     # Create index file
     create_teams_index(all_teams)
 
+    # Refresh the .gz siblings nginx serves (unchanged files are skipped by hash)
+    served = [DATA_DIR / 'teams.json', json_path] + sorted(TEAMS_DIR.glob('*.html'))
+    compressed, _, _ = precompress.precompress(served)
+    print("[INFO] Compressed files updated: " + str(compressed))
+
+    manifest = deploy_manifest.write_deploy_manifest()
+    print("[INFO] Deploy manifest: " + deploy_manifest.summary(manifest))
+
 def create_teams_index(teams_dict):
     """Create an index page listing all teams"""
     index_path = TEAMS_DIR / "index.html"
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Atomic Data File Writer
+Shared writer for the files the site serves (data/*.json, generated pages).
+
+A file is only replaced when its serialized content changes, so unchanged files
+keep their mtime/ETag and stay cached by browsers and the CDN. Changed files are
+written to a temporary file in the same directory, fsynced and renamed over the
+original, so readers never see a truncated file.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def dump_json(data, indent=2, sort_keys=False):
+    """Serialize data the way the repository's JSON files are written."""
+    return json.dumps(data, ensure_ascii=False, indent=indent, sort_keys=sort_keys)
+
+
+def write_bytes(path, payload):
+    """Atomically replace path with payload. Returns False if it already had that content."""
+    path = Path(path)
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.' + path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600; keep it readable by the web server
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    _fsync_dir(path.parent)
+    return True
+
+
+def write_text(path, text):
+    """Atomically write UTF-8 text. Returns False if the file was unchanged."""
+    return write_bytes(path, text.encode('utf-8'))
+
+
+def write_json(path, data, indent=2, sort_keys=False):
+    """Atomically write data as JSON. Returns False if the file was unchanged."""
+    return write_text(path, dump_json(data, indent=indent, sort_keys=sort_keys))
+
+
+def _fsync_dir(directory):
+    # Persist the rename itself; not supported on Windows
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
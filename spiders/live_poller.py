@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Live Score Poller
+Long-running asyncio service for matchdays: polls the resultados-futbol.com
+round pages of the matches in progress and writes what changed through
+update_scores.reconcile_and_save (source "live").
+
+Which pages to poll comes from data/matches.json, re-read every cycle:
+
+    - a match is polled from PRE_KICKOFF before its matchDate until it is
+      "finished" (or MATCH_WINDOW after kickoff, whatever comes first);
+    - a page is polled every FAST_INTERVAL seconds while one of its matches
+      is live or about to end, every SLOW_INTERVAL seconds otherwise;
+    - with nothing in progress the poller sleeps until the next kickoff
+      window (at most IDLE_INTERVAL), then reloads matches.json.
+
+Every tournament in tournament_registry is polled. Pages are fetched
+concurrently through resultados_fetcher.Fetcher (one keep-alive session,
+at most its workers at once, per-host rate limit) and parsed with
+resultados_scraper.
+
+    python spiders/live_poller.py
+    python spiders/live_poller.py --once
+
+Offline test: save result pages under a directory at the same paths as on
+the site (competicion/paulistaa1/2026/grupo1/jornada5), serve it with
+"python -m http.server 8765 --directory DIR" and run the poller with
+--base-url http://127.0.0.1:8765 (and --now to fake the clock).
+spiders/fixtures/resultados holds a recorded round page laid out that way;
+test_live_poller.py runs one cycle against it.
+"""
+
+import asyncio
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+import data_lock
+import update_scores
+from resultados_fetcher import Fetcher
+from resultados_scraper import parse_html_content
+from team_resolver import report_unresolved, team_key
+from tournament_registry import TOURNAMENTS, round_url
+
+PRE_KICKOFF = timedelta(minutes=10)
+MATCH_WINDOW = timedelta(hours=3)
+# From this long after kickoff a match may end any minute
+FINAL_STRETCH = timedelta(minutes=85)
+
+FAST_INTERVAL = 30
+SLOW_INTERVAL = 60
+IDLE_INTERVAL = 15 * 60
+
+
+def kickoff(match):
+    try:
+        return datetime.fromisoformat(match['matchDate'].replace('Z', '+00:00'))
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+def page_url(match, base_url=None):
+    """Round page that carries the live score of match, or None if it is not polled."""
+    number = re.search(r'\d+', match.get('round') or '')
+    if match.get('tournament') not in TOURNAMENTS or not number:
+        return None
+    url = round_url(match['tournament'], number.group())
+    if base_url:
+        parts = urlsplit(url)
+        url = base_url.rstrip('/') + parts.path
+    return url
+
+
+def is_active(match, now):
+    """Whether match is between PRE_KICKOFF and its final whistle (or MATCH_WINDOW)."""
+    start = kickoff(match)
+    if start is None or match.get('status') == 'finished':
+        return False
+    return start - PRE_KICKOFF <= now <= start + MATCH_WINDOW
+
+
+def page_interval(matches, now):
+    """Seconds until a page with these active matches is polled again."""
+    for match in matches:
+        if match.get('status') == 'live' or now >= kickoff(match) + FINAL_STRETCH:
+            return FAST_INTERVAL
+    return SLOW_INTERVAL
+
+
+def idle_interval(matches, now):
+    """Seconds to sleep when nothing is in progress: until the next window opens, capped."""
+    upcoming = [kickoff(m) - PRE_KICKOFF for m in matches
+                if m.get('status') != 'finished' and m.get('tournament') in TOURNAMENTS
+                and kickoff(m) is not None and kickoff(m) - PRE_KICKOFF > now]
+    if not upcoming:
+        return IDLE_INTERVAL
+    return max(1, min(IDLE_INTERVAL, (min(upcoming) - now).total_seconds()))
+
+
+def to_records(scraped_matches):
+    """Scraped matches -> update_scores records (source "live")."""
+    return [{
+        "homeTeam": team_key(match.get("homeTeam", "")),
+        "awayTeam": team_key(match.get("awayTeam", "")),
+        "status": match.get("status"),
+        "score": match.get("score"),
+        "matchDate": match.get("matchDate"),
+        "tournament": match.get("tournament"),
+        "round": match.get("round"),
+        "source": "live",
+    } for match in scraped_matches]
+
+
+class LivePoller:
+    """Polls the pages of active matches until stopped."""
+
+    def __init__(self, base_url=None, clock=None, fetcher=None):
+        self.base_url = base_url
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.fetcher = fetcher or Fetcher()
+        # to_thread runs on the default executor; keep at most fetcher.workers requests in flight
+        self.slots = asyncio.Semaphore(self.fetcher.workers)
+        self.next_poll = {}
+
+    def active_pages(self, matches, now):
+        """{url: (tournament, [active matches])}."""
+        pages = defaultdict(list)
+        tournaments = {}
+        for match in matches:
+            url = page_url(match, self.base_url)
+            if url and is_active(match, now):
+                pages[url].append(match)
+                tournaments[url] = match['tournament']
+        return {url: (tournaments[url], page_matches) for url, page_matches in pages.items()}
+
+    async def poll_page(self, url, tournament):
+        """Fetch and parse one page. Returns its records."""
+        async with self.slots:
+            html = await asyncio.to_thread(self.fetcher.get, url)
+        return to_records(parse_html_content(html, url, tournament).get('matches', []))
+
+    async def cycle(self):
+        """Poll every page that is due. Returns the seconds until the next cycle."""
+        matches, _ = data_lock.read_json(update_scores.MATCHES_FILE, default={"matches": []})
+        matches = matches.get('matches', [])
+        now = self.clock()
+        pages = self.active_pages(matches, now)
+        if not pages:
+            self.next_poll.clear()
+            return idle_interval(matches, now)
+
+        loop = asyncio.get_running_loop()
+        due = [url for url in pages if self.next_poll.get(url, 0) <= loop.time()]
+        results = await asyncio.gather(*(self.poll_page(url, pages[url][0]) for url in due),
+                                       return_exceptions=True)
+
+        records = []
+        for url, result in zip(due, results):
+            if isinstance(result, Exception):
+                print(f"[WARN] {url}: {result}")
+            else:
+                records.extend(result)
+            self.next_poll[url] = loop.time() + page_interval(pages[url][1], now)
+        for url in list(self.next_poll):
+            if url not in pages:
+                del self.next_poll[url]
+
+        if records:
+            # Runs the page rebuild too; keep the event loop free meanwhile
+            updated = await asyncio.to_thread(update_scores.reconcile_and_save, records)
+            print(f"[INFO] {now:%H:%M:%S} polled {len(due)} pages, {updated or 0} matches updated")
+            report_unresolved()
+        return max(1, min(self.next_poll.values()) - loop.time())
+
+    async def run(self, once=False):
+        while True:
+            delay = await self.cycle()
+            if once:
+                return
+            await asyncio.sleep(delay)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Poll live scores of the matches in progress")
+    parser.add_argument('--once', action='store_true', help="run one polling cycle and exit")
+    parser.add_argument('--base-url', help="fetch pages from this host instead (e.g. a local stand-in)")
+    parser.add_argument('--now', help="pretend it is this time (ISO 8601 with UTC offset, e.g. 2026-02-01T19:30:00-03:00)")
+    args = parser.parse_args()
+
+    clock = None
+    if args.now:
+        # matchDate values carry an offset; a naive time cannot be compared with them
+        start = kickoff({'matchDate': args.now})
+        if start is None or start.tzinfo is None:
+            parser.error(f"--now: expected an ISO 8601 time with UTC offset, got {args.now!r}")
+        started = datetime.now(timezone.utc)
+        clock = lambda: start + (datetime.now(timezone.utc) - started)
+
+    try:
+        asyncio.run(LivePoller(base_url=args.base_url, clock=clock).run(once=args.once))
+    except KeyboardInterrupt:
+        print("\n[INFO] Poller stopped")
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite Match Store
+Optional database copy of data/matches.json, teams.json, tournaments.json and
+canais.json, for jobs that want indexed single-row updates instead of
+rewriting whole JSON files.
+
+    python spiders/match_store.py import           # data/*.json -> db/futebol.sqlite3
+    python spiders/match_store.py export           # db -> data/*.json (byte for byte)
+    python spiders/match_store.py export --check   # exit 1 if data/*.json differ from the db
+
+Tables: matches, teams, tournaments, channels and broadcasts, indexed on match
+day, team, tournament/round, status and channel. Each row keeps the original
+JSON object (key order included) next to the indexed columns, and the
+documents table remembers each file's layout, so export reproduces the files
+exactly. The database uses WAL mode, so several jobs can read and write it
+at the same time.
+
+The JSON files stay what the site serves: run export after changing the store.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import change_log
+import json_store
+import precompress
+from catalog import CHANNEL_ALIASES, match_day
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+STORE_FILE = BASE_DIR / 'db' / 'futebol.sqlite3'
+
+# table -> (data file, top-level list key)
+DOCUMENTS = {
+    'matches': ('matches.json', 'matches'),
+    'teams': ('teams.json', 'teams'),
+    'tournaments': ('tournaments.json', 'tournaments'),
+    'channels': ('canais.json', 'canais'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    envelope TEXT NOT NULL,
+    indent INTEGER,
+    ensure_ascii INTEGER NOT NULL,
+    trailing_newline INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    slug TEXT,
+    status TEXT,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    slug TEXT,
+    state TEXT,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    slug TEXT,
+    type TEXT,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    tournament TEXT,
+    round TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    match_date TEXT,
+    match_day TEXT,
+    status TEXT,
+    home_score INTEGER,
+    away_score INTEGER,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS broadcasts (
+    match_id TEXT NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    channel TEXT,
+    channel_id TEXT,
+    type TEXT,
+    PRIMARY KEY (match_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_day ON matches(match_day, match_date);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches(home_team, match_date);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches(away_team, match_date);
+CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament, round);
+CREATE INDEX IF NOT EXISTS idx_matches_status ON matches(status);
+CREATE INDEX IF NOT EXISTS idx_broadcasts_channel ON broadcasts(channel_id);
+"""
+
+# Indexed columns of each table, read from the JSON object
+COLUMNS = {
+    'tournaments': lambda t: {'name': t.get('name'), 'slug': t.get('slug'), 'status': t.get('status')},
+    'teams': lambda t: {'name': t.get('name'), 'slug': t.get('slug'), 'state': t.get('state')},
+    'channels': lambda c: {'name': c.get('name'), 'slug': c.get('slug'), 'type': c.get('type')},
+    'matches': lambda m: {
+        'tournament': m.get('tournament'),
+        'round': m.get('round'),
+        'home_team': m.get('homeTeam'),
+        'away_team': m.get('awayTeam'),
+        'match_date': m.get('matchDate'),
+        'match_day': match_day(m),
+        'status': m.get('status'),
+        'home_score': (m.get('score') or {}).get('home'),
+        'away_score': (m.get('score') or {}).get('away'),
+    },
+}
+
+
+def connect(path=STORE_FILE):
+    """Open (and create if needed) the store."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def detect_layout(text, data):
+    """Find the json.dumps options that reproduce text exactly.
+
+    Returns (indent, ensure_ascii, trailing_newline), or None if no
+    combination does.
+    """
+    for indent in (2, 4, None):
+        for ensure_ascii in (False, True):
+            dumped = json.dumps(data, ensure_ascii=ensure_ascii, indent=indent)
+            if text == dumped:
+                return indent, ensure_ascii, False
+            if text == dumped + '\n':
+                return indent, ensure_ascii, True
+    return None
+
+
+def _write_row(conn, table, obj, position):
+    columns = dict(id=obj['id'], position=position, **COLUMNS[table](obj), doc=_dumps(obj))
+    names = ', '.join(columns)
+    placeholders = ', '.join('?' for _ in columns)
+    conn.execute(f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({placeholders})", list(columns.values()))
+
+    if table == 'matches':
+        conn.execute("DELETE FROM broadcasts WHERE match_id = ?", (obj['id'],))
+        conn.executemany(
+            "INSERT INTO broadcasts (match_id, position, channel, channel_id, type) VALUES (?, ?, ?, ?, ?)",
+            [(obj['id'], i, b.get('channel'), CHANNEL_ALIASES.get((b.get('channel') or '').lower().strip()),
+              b.get('type')) for i, b in enumerate(obj.get('broadcasting', []))])
+
+
+def import_json(conn, data_dir=DATA_DIR):
+    """Replace the store's contents with data_dir/*.json. Returns {table: rows}."""
+    counts = {}
+    with conn:
+        for table, (filename, list_key) in DOCUMENTS.items():
+            text = (Path(data_dir) / filename).read_text(encoding='utf-8')
+            data = json.loads(text)
+            layout = detect_layout(text, data)
+            if layout is None:
+                print(f"[WARN] {filename} is not in a standard json.dumps layout; export will use indent=2")
+                layout = (2, False, False)
+
+            items = data.get(list_key, [])
+            # The rest of the file, with the list itself left empty
+            envelope = dict(data)
+            envelope[list_key] = []
+            indent, ensure_ascii, trailing_newline = layout
+            conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?)",
+                         (table, _dumps(envelope), indent, int(ensure_ascii), int(trailing_newline)))
+
+            conn.execute(f"DELETE FROM {table}")
+            for position, obj in enumerate(items):
+                _write_row(conn, table, obj, position)
+            counts[table] = len(items)
+    return counts
+
+
+def export_documents(conn):
+    """Rebuild the data files from the store. Returns {filename: text}."""
+    texts = {}
+    for table, (filename, list_key) in DOCUMENTS.items():
+        row = conn.execute("SELECT envelope, indent, ensure_ascii, trailing_newline FROM documents WHERE name = ?",
+                           (table,)).fetchone()
+        if row is None:
+            continue
+        envelope, indent, ensure_ascii, trailing_newline = row
+        data = json.loads(envelope)
+        data[list_key] = [json.loads(doc) for (doc,) in
+                          conn.execute(f"SELECT doc FROM {table} ORDER BY position")]
+        text = json.dumps(data, ensure_ascii=bool(ensure_ascii), indent=indent)
+        texts[filename] = text + '\n' if trailing_newline else text
+    return texts
+
+
+def export_json(conn, data_dir=DATA_DIR):
+    """Write the data files from the store, and their .gz siblings (unchanged files are left alone).
+
+    Returns the list of files rewritten.
+    """
+    written = []
+    for filename, text in export_documents(conn).items():
+        path = Path(data_dir) / filename
+        if filename == DOCUMENTS['matches'][0]:
+            changed, _ = change_log.write_matches(path, json.loads(text), 'match_store', text=text)
+        else:
+            changed = json_store.write_text(path, text)
+        if changed:
+            written.append(filename)
+    # Only the site's own data files are served (and have .gz siblings)
+    if written and Path(data_dir).resolve() == DATA_DIR.resolve():
+        precompress.precompress([Path(data_dir) / filename for filename in written])
+    return written
+
+
+# Single-row access
+
+def get_match(conn, match_id):
+    row = conn.execute("SELECT doc FROM matches WHERE id = ?", (match_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def matches_on(conn, day):
+    """Matches on a local calendar day ('YYYY-MM-DD'), by kickoff."""
+    return [json.loads(doc) for (doc,) in
+            conn.execute("SELECT doc FROM matches WHERE match_day = ? ORDER BY match_date, position", (day,))]
+
+
+def matches_for_team(conn, team_id):
+    return [json.loads(doc) for (doc,) in conn.execute(
+        "SELECT doc FROM matches WHERE home_team = ? UNION ALL SELECT doc FROM matches WHERE away_team = ?",
+        (team_id, team_id))]
+
+
+def update_match(conn, match_id, **fields):
+    """Set top-level fields of one match (e.g. score=..., status=...).
+
+    Returns the updated match, or None if match_id is unknown.
+    """
+    with conn:
+        row = conn.execute("SELECT position, doc FROM matches WHERE id = ?", (match_id,)).fetchone()
+        if row is None:
+            return None
+        position, doc = row
+        match = json.loads(doc)
+        match.update(fields)
+        _write_row(conn, 'matches', match, position)
+    return match
+
+
+def upsert_match(conn, match):
+    """Insert a new match at the end of matches.json, or replace an existing one in place."""
+    with conn:
+        row = conn.execute("SELECT position FROM matches WHERE id = ?", (match['id'],)).fetchone()
+        if row is None:
+            row = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM matches").fetchone()
+        _write_row(conn, 'matches', match, row[0])
+    return match
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="SQLite copy of the data/*.json files")
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('--db', default=str(STORE_FILE), help="database file")
+    parser.add_argument('--check', action='store_true',
+                        help="with export: only compare, exit 1 if data/*.json differ from the store")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == 'import':
+        for table, count in import_json(conn).items():
+            print(f"[OK] Imported {count} {table}")
+    elif args.check:
+        differing = [filename for filename, text in export_documents(conn).items()
+                     if (DATA_DIR / filename).read_text(encoding='utf-8') != text]
+        for filename in differing:
+            print(f"[DIFF] {filename}")
+        if differing:
+            sys.exit(1)
+        print("[OK] data/*.json match the store")
+    else:
+        written = export_json(conn)
+        print(f"[OK] Exported {len(written)} changed files: {', '.join(written) or 'none'}")
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Generated Page Index
+Keeps track of every match page generate_match_pages owns, in
+.build/match_pages_manifest.json:
+
+    {"version": N, "pages": {match_id: {"path": "<tournament>/<dd-mm-yyyy>/<slug>/index.html",
+                                        "hash": "<sha256 of the page inputs>"}}}
+
+Other tools can list the generated pages from here without walking the tree,
+and the generator uses it to prune pages no match points to anymore.
+"""
+
+import json
+import re
+from pathlib import Path
+
+import json_store
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+BUILD_DIR = BASE_DIR / '.build'
+MANIFEST_FILE = BUILD_DIR / 'match_pages_manifest.json'
+
+PAGE_SIBLING_SUFFIXES = ('.gz', '.br')
+_DATE_DIR_RE = re.compile(r'^\d{2}-\d{2}-\d{4}$')
+
+
+def load_manifest():
+    """Load the page manifest, or an empty one if it is missing or unreadable."""
+    if not MANIFEST_FILE.exists():
+        return {"version": None, "pages": {}}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable page manifest: {e}")
+        return {"version": None, "pages": {}}
+    manifest.setdefault('pages', {})
+    return manifest
+
+
+def save_manifest(manifest):
+    """Save the page manifest (sorted, so unchanged builds leave it untouched)."""
+    json_store.write_json(MANIFEST_FILE, manifest, sort_keys=True)
+
+
+def list_generated_pages(manifest=None):
+    """Return the sorted relative paths of every generated match page."""
+    if manifest is None:
+        manifest = load_manifest()
+    return sorted({page['path'] for page in manifest['pages'].values()})
+
+
+def scan_pages(tournament_ids):
+    """Find <tournament>/<dd-mm-yyyy>/<slug>/index.html pages already on disk.
+
+    Used once to adopt pages built before the manifest existed.
+    """
+    found = []
+    for tournament_id in sorted(tournament_ids):
+        tournament_dir = BASE_DIR / tournament_id
+        if not tournament_dir.is_dir():
+            continue
+        for page_file in tournament_dir.glob('*/*/index.html'):
+            if _DATE_DIR_RE.match(page_file.parent.parent.name):
+                found.append(page_file.relative_to(BASE_DIR).as_posix())
+    return sorted(found)
+
+
+def prune_pages(stale_paths):
+    """Delete stale pages, their compressed siblings and the directories left empty.
+
+    Returns the list of page paths removed.
+    """
+    removed = []
+    for key in sorted(stale_paths):
+        page_file = BASE_DIR / key
+        for sibling in [page_file] + [page_file.with_name(page_file.name + s) for s in PAGE_SIBLING_SUFFIXES]:
+            if sibling.exists():
+                sibling.unlink()
+        removed.append(key)
+
+        # Remove <slug>/ and <dd-mm-yyyy>/ once empty, never the tournament directory
+        directory = page_file.parent
+        for _ in range(2):
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+            directory = directory.parent
+    return removed
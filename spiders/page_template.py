@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Page Template Engine
+Compiles an HTML template once into static chunks and named slots, so each page
+is rendered with a single join instead of re-scanning the whole template.
+
+Slots recognized in the template:
+    head         - inserted right before </head>
+    title        - text of the <title> tag (defaults to the template text)
+    description  - content of <meta name="description"> (defaults to the template text)
+    root         - relative path back to the site root, prefixed to every relative
+                   href/src and to absolute fetch('/...') calls
+    {{name}}     - any other named placeholder
+"""
+
+import re
+from pathlib import Path
+
+_HEAD_RE = re.compile(r'</head>')
+_TITLE_RE = re.compile(r'(<title\b[^>]*>)(.*?)(</title>)', re.DOTALL)
+_DESCRIPTION_RE = re.compile(r'(<meta\s+name="description"[^>]*?\bcontent=")([^"]*)("[^>]*>)')
+# href/src values that are relative: no scheme, no leading / or #, no JS or {{ }} interpolation, not empty
+_RELATIVE_URL_RE = re.compile(r'(?<![\w.])((?:href|src)=")(?![a-zA-Z][a-zA-Z0-9+.-]*:|/|#|\$\{|\{\{|")')
+_ROOT_FETCH_RE = re.compile(r'''(fetch\(['"])/(?!/)''')
+_PLACEHOLDER_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+class _Slot:
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+
+
+def _find_slots(source):
+    """Return (start, end, pieces) for every slot found in source."""
+    found = []
+
+    head = _HEAD_RE.search(source)
+    if head:
+        found.append((head.start(), head.end(), [_Slot('head', ''), head.group(0)]))
+
+    # Title and description fall back to their {{ }} placeholders when the template has them
+    title = _TITLE_RE.search(source)
+    if title and not _PLACEHOLDER_RE.search(title.group(2)):
+        found.append((title.start(), title.end(),
+                      [title.group(1), _Slot('title', title.group(2)), title.group(3)]))
+
+    description = _DESCRIPTION_RE.search(source)
+    if description and not _PLACEHOLDER_RE.search(description.group(2)):
+        # The tag is written back on one line
+        found.append((description.start(), description.end(),
+                      [re.sub(r'\s+', ' ', description.group(1)), _Slot('description', description.group(2)),
+                       description.group(3)]))
+
+    for m in _RELATIVE_URL_RE.finditer(source):
+        found.append((m.start(), m.end(), [m.group(1), _Slot('root', '')]))
+
+    for m in _ROOT_FETCH_RE.finditer(source):
+        found.append((m.start(), m.end(), [m.group(1), _Slot('root', '')]))
+
+    for m in _PLACEHOLDER_RE.finditer(source):
+        found.append((m.start(), m.end(), [_Slot(m.group(1))]))
+
+    return sorted(found, key=lambda item: item[0])
+
+
+class PageTemplate:
+    """An HTML template parsed once into static chunks and named slots."""
+
+    def __init__(self, source):
+        self._chunks = []
+        self._slots = []  # (chunk index, slot)
+
+        position = 0
+        for start, end, pieces in _find_slots(source):
+            if start < position:
+                # Overlaps a slot already taken
+                continue
+            self._append(source[position:start])
+            for piece in pieces:
+                if isinstance(piece, _Slot):
+                    self._slots.append((len(self._chunks), piece))
+                    self._chunks.append(piece.default)
+                else:
+                    self._append(piece)
+            position = end
+        self._append(source[position:])
+
+    def _append(self, text):
+        if text:
+            self._chunks.append(text)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read())
+
+    @property
+    def slot_names(self):
+        return {slot.name for _, slot in self._slots}
+
+    def render(self, **values):
+        """Fill the slots and join the page. Slots without a default must be given."""
+        chunks = list(self._chunks)
+        for index, slot in self._slots:
+            value = values.get(slot.name, slot.default)
+            if value is None:
+                raise KeyError("Missing value for template slot: " + slot.name)
+            chunks[index] = value
+        return ''.join(chunks)
+
+
+def relative_root(page_dir, base_dir):
+    """Return the '../' prefix that leads from page_dir back to base_dir."""
+    depth = len(Path(page_dir).relative_to(base_dir).parts)
+    return '../' * depth
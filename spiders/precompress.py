@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Precompress Site Files
+Writes .gz siblings (maximum compression) next to generated pages,
+data/*.json and its shards, app.js, router.js and styles.css, so nginx can
+serve them with gzip_static instead of compressing on every request.
+
+Only files whose content changed since the last run are recompressed; the
+content hashes are kept in .build/precompress_manifest.json. With workers > 1
+the files are compressed in that many processes.
+
+Every script that writes served files (generate_match_pages,
+generate_team_pages, scrape_team_details, match_store export) refreshes the
+siblings of what it wrote, so nginx never serves a stale .gz. After editing
+app.js, router.js, data-decoder.js or styles.css by hand, run with --static
+(the Dockerfile does it on every image build).
+
+.br siblings are opt-in (--brotli): the nginx:alpine image the site ships in
+has no ngx_brotli, so they would never be served, and brotli is by far the
+slowest part of a build. They need the optional 'brotli' package
+(pip install brotli).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import json_store
+import page_index
+import shards
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+TEAMS_DIR = BASE_DIR / 'times'
+BUILD_DIR = BASE_DIR / '.build'
+MANIFEST_FILE = BUILD_DIR / 'precompress_manifest.json'
+
+STATIC_FILES = ['app.js', 'router.js', 'data-decoder.js', 'styles.css']
+
+# Smaller files gain nothing from compression
+MIN_SIZE = 256
+
+# Quality 11 is ~8% smaller on match pages but ~6x slower
+BROTLI_QUALITY = 9
+
+
+def compress_gzip(payload):
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def compress_brotli(payload):
+    return brotli.compress(payload, quality=BROTLI_QUALITY)
+
+
+def sibling_paths(path, with_brotli=False):
+    """Return the {suffix: path} of the compressed siblings written for path."""
+    siblings = {'.gz': path.with_name(path.name + '.gz')}
+    if with_brotli:
+        siblings['.br'] = path.with_name(path.name + '.br')
+    return siblings
+
+
+def compress_file(job):
+    """Write the siblings of one file (runs in the worker processes)."""
+    path, with_brotli = job
+    payload = path.read_bytes()
+    siblings = sibling_paths(path, with_brotli)
+    json_store.write_bytes(siblings['.gz'], compress_gzip(payload))
+    if '.br' in siblings:
+        json_store.write_bytes(siblings['.br'], compress_brotli(payload))
+    else:
+        # Never leave a .br from an older build next to newer content
+        stale_br = path.with_name(path.name + '.br')
+        if stale_br.exists():
+            stale_br.unlink()
+
+
+def static_targets():
+    """The hand-written files the site serves (app.js, styles.css, ...)."""
+    return [path for path in (BASE_DIR / name for name in STATIC_FILES) if path.is_file()]
+
+
+def default_targets():
+    """Every file the build serves that should have compressed siblings."""
+    targets = static_targets()
+    targets += sorted(DATA_DIR.glob('*.json'))
+    targets += shards.shard_files()
+    targets += sorted(TEAMS_DIR.glob('*.html'))
+
+    targets += [BASE_DIR / key for key in page_index.list_generated_pages()]
+
+    return [path for path in targets if path.is_file()]
+
+
+def load_manifest():
+    if not MANIFEST_FILE.exists():
+        return {}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def remove_siblings(path):
+    removed = 0
+    for suffix in page_index.PAGE_SIBLING_SUFFIXES:
+        sibling = path.with_name(path.name + suffix)
+        if sibling.exists():
+            sibling.unlink()
+            removed += 1
+    return removed
+
+
+def precompress(targets=None, force=False, workers=1, with_brotli=False):
+    """Compress changed targets (default: every served file).
+
+    Returns (compressed, unchanged, removed) counts.
+    """
+    with_brotli = with_brotli and brotli is not None
+    full_run = targets is None
+    if full_run:
+        targets = default_targets()
+
+    manifest = {} if force else load_manifest()
+    # A partial run keeps the entries of the files it was not asked about
+    updated = {} if full_run else dict(manifest)
+    unchanged = removed = 0
+    jobs = []
+
+    for path in targets:
+        key = path.relative_to(BASE_DIR).as_posix()
+        payload = path.read_bytes()
+
+        if len(payload) < MIN_SIZE:
+            updated.pop(key, None)
+            removed += remove_siblings(path)
+            continue
+
+        digest = hashlib.sha256(payload).hexdigest()
+        siblings = sibling_paths(path, with_brotli)
+        updated[key] = digest
+
+        if manifest.get(key) == digest and all(p.exists() for p in siblings.values()):
+            unchanged += 1
+            continue
+        jobs.append((path, with_brotli))
+
+    if workers <= 1 or len(jobs) < 2:
+        for job in jobs:
+            compress_file(job)
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(compress_file, jobs, chunksize=chunksize))
+    compressed = len(jobs)
+
+    # Drop siblings of files that no longer exist
+    if full_run:
+        for key in set(manifest) - set(updated):
+            path = BASE_DIR / key
+            if not path.exists():
+                removed += remove_siblings(path)
+
+    json_store.write_json(MANIFEST_FILE, updated, sort_keys=True)
+    return compressed, unchanged, removed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write .gz siblings (and optionally .br) for the files the site serves")
+    parser.add_argument('--force', action='store_true', help="recompress every file")
+    parser.add_argument('--workers', type=int, default=1, help="compress in N processes (0 = one per CPU core)")
+    parser.add_argument('--brotli', action='store_true',
+                        help="also write .br siblings (only useful behind nginx with ngx_brotli)")
+    parser.add_argument('--static', action='store_true',
+                        help="only the hand-written files: " + ", ".join(STATIC_FILES))
+    args = parser.parse_args()
+
+    if args.brotli and brotli is None:
+        print("[WARN] 'brotli' package not installed; writing .gz files only")
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    targets = static_targets() if args.static else None
+    compressed, unchanged, removed = precompress(targets, force=args.force, workers=workers,
+                                                 with_brotli=args.brotli)
+    print(f"Precompressed {compressed} files, {unchanged} unchanged, {removed} stale siblings removed")
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Resultados Multi-Round Fetcher
+Fetches round (jornada) pages of the competitions in tournament_registry from
+resultados-futbol.com in one run, parses them with resultados_scraper and
+writes a single merged resultados/<timestamp>_resultados.json:
+
+    python spiders/resultados_fetcher.py                      # default round of every tournament
+    python spiders/resultados_fetcher.py paulistao26 --rounds 1-8
+    python spiders/resultados_fetcher.py carioca26 paulistao26 --rounds 4 --workers 2
+
+Requests for every tournament share one keep-alive session, at most --workers
+run at once, and requests to the same host start at least 1/--rate seconds
+apart.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import json_store
+from resultados_scraper import parse_html_content
+from tournament_registry import TOURNAMENTS, round_url
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+RESULTADOS_DIR = BASE_DIR / 'resultados'
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+REQUEST_TIMEOUT = 30
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 2.0  # requests per second per host
+
+
+class HostRateLimiter:
+    """Spaces the start of requests to the same host by 1/rate seconds (thread-safe)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._lock = threading.Lock()
+        self._next = {}
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Fetcher:
+    """Pooled keep-alive session with bounded concurrency and a per-host rate limit."""
+
+    def __init__(self, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE):
+        self.workers = max(1, workers)
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.limiter = HostRateLimiter(rate)
+
+    def get(self, url):
+        """Return the text of url (raises on HTTP errors)."""
+        self.limiter.wait(url)
+        response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+    def get_many(self, urls):
+        """Fetch urls concurrently. Returns {url: text or the exception raised}."""
+        def fetch(url):
+            try:
+                return self.get(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return dict(zip(urls, executor.map(fetch, urls)))
+
+
+def parse_rounds(spec):
+    """'1-8' or '1,3,5-7' -> [1, 2, ...]."""
+    rounds = []
+    for part in spec.split(','):
+        start, _, end = part.partition('-')
+        rounds.extend(range(int(start), int(end or start) + 1))
+    return sorted(set(rounds))
+
+
+def fetch_rounds(targets, fetcher=None):
+    """Fetch and parse rounds of several tournaments in one pool.
+
+    targets is {tournament: [round numbers]} (None for its default round).
+    Returns ({"matches": [...]}, failed urls).
+    """
+    fetcher = fetcher or Fetcher()
+    pages = {}
+    for tournament, rounds in targets.items():
+        for number in rounds or [None]:
+            pages[round_url(tournament, number)] = tournament
+
+    matches = {}
+    failed = []
+    for url, page in fetcher.get_many(list(pages)).items():
+        if isinstance(page, Exception):
+            print(f"[WARN] {url}: {page}")
+            failed.append(url)
+            continue
+        round_matches = parse_html_content(page, url, pages[url]).get('matches', [])
+        print(f"[OK] {url}: {len(round_matches)} matches")
+        for match in round_matches:
+            # A match listed in two rounds (moved game) is kept once
+            matches[match['id']] = match
+    return {"matches": list(matches.values())}, failed
+
+
+def write_resultados(result, resultados_dir=RESULTADOS_DIR):
+    """Write result where resultados_store picks it up. Returns the path.
+
+    Written atomically: resultados_store.ingest may read the directory at the
+    same time, and a file it ingests is never parsed again.
+    """
+    path = resultados_dir / f"{datetime.now().strftime('%d%m%Y-%H%M%S')}_resultados.json"
+    json_store.write_json(path, result)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from team_resolver import report_unresolved
+
+    parser = argparse.ArgumentParser(description="Fetch competition rounds from resultados-futbol.com")
+    parser.add_argument('tournaments', nargs='*', metavar='tournament',
+                        help=f"tournaments to fetch (default: all of {', '.join(sorted(TOURNAMENTS))})")
+    parser.add_argument('--rounds', help="round numbers, e.g. 1-8 or 1,3,5-7 (default: each tournament's default round)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="concurrent requests")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="max requests per second per host")
+    args = parser.parse_args()
+    unknown = sorted(set(args.tournaments) - set(TOURNAMENTS))
+    if unknown:
+        parser.error(f"unknown tournaments: {', '.join(unknown)} (registered: {', '.join(sorted(TOURNAMENTS))})")
+
+    started = time.monotonic()
+    rounds = parse_rounds(args.rounds) if args.rounds else None
+    targets = {tournament: rounds for tournament in args.tournaments or TOURNAMENTS}
+    result, failed = fetch_rounds(targets, Fetcher(args.workers, args.rate))
+    report_unresolved()
+    path = write_resultados(result)
+    print(f"[OK] {len(result['matches'])} matches saved to {path.relative_to(BASE_DIR).as_posix()} "
+          f"in {time.monotonic() - started:.1f}s")
+    if failed:
+        sys.exit(1)
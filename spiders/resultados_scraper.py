@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Resultados Match Data Scraper
+=============================
+
+Extracts football match data from resultados-futbol.com round pages, for
+every competition in tournament_registry (one engine, config per tournament).
+Pages are fetched by resultados_fetcher (a whole competition, or several, in
+one run) and live_poller; this module only parses them.
+
+Dependencies:
+    pip install requests beautifulsoup4 lxml
+
+Usage (parse a saved page offline):
+    python resultados_scraper.py carioca26 jornada4.html --url https://www.resultados-futbol.com/competicion/carioca_1/2026/grupo1/jornada4
+"""
+
+import re
+from typing import Optional, Dict, Tuple
+
+from bs4 import BeautifulSoup
+
+from team_resolver import resolve_team
+from tournament_registry import get_tournament
+
+
+# =============================================================================
+# Parser Setup
+# =============================================================================
+
+HTML_PARSER = 'lxml'
+
+TEAM_LINK_RE = re.compile(r'/equipo/')
+MATCH_LINK_RE = re.compile(r'/partido/')
+MATCH_URL_RE = re.compile(r'/partido/([^/]+)/([^/]+)/\d+')
+ROUND_RE = re.compile(r'jornada(\d+)')
+DATE_TIME_RE = re.compile(r'(\d{1,2}\s+\w{3}\s+\d{2})\s+(\d{2}:\d{2})')
+SCORE_RE = re.compile(r'(\d+)\s*[-:]\s*(\d+)')
+HTML_VENUE_RE = re.compile(r'Estádio[^|<\n]+')
+
+# Text/markdown pages (from web fetch tools)
+TEXT_BLOCK_RE = re.compile(r'(?=\|\s*\d{1,2}\s+\w{3}\s+\d{2}\s+\d{2}:\d{2})')
+TEXT_DATE_STATUS_RE = re.compile(
+    r'(\d{1,2}\s+\w{3}\s+\d{2})\s+(\d{2}:\d{2})\s+(Finalizado|Sin comenzar|En juego)', re.IGNORECASE
+)
+TEXT_TEAM_RE = re.compile(r'\[([^\]]+)\]\(/equipo/')
+TEXT_SCORE_RE = re.compile(r'\[(\d+)-(\d+)\]')
+TEXT_MATCH_URL_RE = re.compile(r'/partido/([^)]+)')
+TEXT_VENUE_RE = re.compile(r'Estádio[^\[\n|]+')
+
+MONTH_MAP = {
+    'ene': '01', 'feb': '02', 'mar': '03', 'abr': '04',
+    'may': '05', 'jun': '06', 'jul': '07', 'ago': '08',
+    'sep': '09', 'oct': '10', 'nov': '11', 'dic': '12'
+}
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+def parse_spanish_date(date_str: str, time_str: str) -> Optional[str]:
+    """
+    Parse Spanish date format to ISO 8601 with Brazil timezone.
+    """
+    try:
+        parts = date_str.strip().split()
+        if len(parts) >= 3:
+            day = parts[0].zfill(2)
+            month = MONTH_MAP.get(parts[1].lower()[:3], '01')
+            year = '20' + parts[2] if len(parts[2]) == 2 else parts[2]
+
+            time_parts = time_str.strip().split(':')
+            hour = time_parts[0].zfill(2)
+            minute = time_parts[1].zfill(2) if len(time_parts) > 1 else '00'
+
+            return f"{year}-{month}-{day}T{hour}:{minute}:00-03:00"
+    except Exception:
+        pass
+
+    return None
+
+
+def extract_stadium_info(stadium_name: str, venues: Dict[str, str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract stadium name and city (looked up in the tournament's venue table) from raw stadium text.
+    """
+    if not stadium_name:
+        return None, None
+
+    stadium_name = re.sub(r'\s+', ' ', stadium_name.strip())
+    name_lower = stadium_name.lower()
+
+    for key, city in venues.items():
+        if key in name_lower:
+            return stadium_name, city
+
+    return stadium_name, None
+
+
+def determine_status(text: str, has_score: bool) -> str:
+    """
+    Determine match status from text content.
+    """
+    text_lower = text.lower()
+
+    if any(x in text_lower for x in ['finalizado', 'fin', 'terminado']):
+        return 'finished'
+    elif any(x in text_lower for x in ['sin comenzar', 'próximo', 'programado']):
+        return 'scheduled'
+    elif any(x in text_lower for x in ['en juego', 'live', 'en vivo']):
+        return 'live'
+    elif any(x in text_lower for x in ['aplazado', 'postponed']):
+        return 'postponed'
+    elif any(x in text_lower for x in ['suspendido', 'suspended']):
+        return 'suspended'
+    elif has_score:
+        return 'finished'
+    else:
+        return 'scheduled'
+
+
+def extract_teams_from_match_url(match_url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract home and away team slugs from matchURL.
+    URL format: /partido/HomeTeam/AwayTeam/YYYYDDSequencialNumber
+
+    Returns:
+        Tuple of (home_team_slug, away_team_slug)
+    """
+    if not match_url:
+        return None, None
+
+    match = MATCH_URL_RE.search(match_url)
+    if match:
+        return match.group(1), match.group(2)
+
+    return None, None
+
+
+def round_name(url: str, config: Dict) -> str:
+    """
+    Round name from the page URL, or the tournament's default round.
+    """
+    round_match = ROUND_RE.search(url.lower())
+    return f"Jornada {round_match.group(1) if round_match else config['round']}"
+
+
+def build_match(tournament: str, config: Dict, round_label: str, home_team: str, away_team: str,
+                match_date: Optional[str], status: str, score_home: Optional[int],
+                score_away: Optional[int], venue_text: Optional[str], match_url: Optional[str]) -> Dict:
+    """
+    Build one match record in the matches.json format.
+    """
+    # Extract teams from matchURL (more reliable)
+    url_home, url_away = extract_teams_from_match_url(match_url)
+
+    # Use URL-extracted teams, fallback to page-scraped teams; both resolved to teams.json ids
+    home_slug = resolve_team(url_home or home_team)
+    away_slug = resolve_team(url_away or away_team)
+
+    venue_name, venue_city = extract_stadium_info(venue_text, config['venues'])
+
+    date_for_id = "unknown"
+    if match_date:
+        y, m, d = match_date.split('T')[0].split('-')
+        date_for_id = f"{d}-{m}-{y}"
+
+    return {
+        "id": f"{tournament}-{home_slug}-vs-{away_slug}-{date_for_id}",
+        "tournament": tournament,
+        "homeTeam": home_slug,
+        "awayTeam": away_slug,
+        "matchDate": match_date,
+        "round": round_label,
+        "status": status,
+        "score": {"home": score_home, "away": score_away},
+        "venue": {"name": venue_name, "city": venue_city, "state": config['state']},
+        "broadcasting": [],
+        "matchURL": match_url
+    }
+
+
+# =============================================================================
+# HTML Parser
+# =============================================================================
+
+def parse_html_content(html: str, url: str, tournament: str) -> Dict:
+    """
+    Parse a round page of tournament using BeautifulSoup.
+    """
+    config = get_tournament(tournament)
+    soup = BeautifulSoup(html, HTML_PARSER)
+    matches = []
+    round_label = round_name(url, config)
+    seen = set()
+
+    for table in soup.find_all('table'):
+        for row in table.find_all('tr'):
+            team_links = row.find_all('a', href=TEAM_LINK_RE)
+            if len(team_links) < 2:
+                continue
+
+            home_team = team_links[0].get_text(strip=True)
+            away_team = team_links[1].get_text(strip=True)
+
+            key = f"{home_team}-{away_team}"
+            if key in seen:
+                continue
+            seen.add(key)
+
+            row_text = row.get_text()
+
+            # Extract date/time
+            dt_match = DATE_TIME_RE.search(row_text)
+            match_date = None
+            if dt_match:
+                match_date = parse_spanish_date(dt_match.group(1), dt_match.group(2))
+
+            # Extract score
+            score_link = row.find('a', href=MATCH_LINK_RE)
+            score_home, score_away = None, None
+            match_url = None
+
+            if score_link:
+                match_url = score_link.get('href')
+                score_match = SCORE_RE.search(score_link.get_text(strip=True))
+                if score_match:
+                    score_home = int(score_match.group(1))
+                    score_away = int(score_match.group(2))
+
+            status = determine_status(row_text, score_home is not None)
+            venue_match = HTML_VENUE_RE.search(row_text)
+
+            matches.append(build_match(
+                tournament, config, round_label, home_team, away_team, match_date, status,
+                score_home, score_away, venue_match.group(0) if venue_match else None, match_url
+            ))
+
+    return {"matches": matches}
+
+
+# =============================================================================
+# Text/Markdown Parser
+# =============================================================================
+
+def parse_text_content(content: str, url: str, tournament: str) -> Dict:
+    """
+    Parse text/markdown content of a round page (from web fetch tools).
+    """
+    config = get_tournament(tournament)
+    matches = []
+    round_label = round_name(url, config)
+    seen = set()
+
+    for block in TEXT_BLOCK_RE.split(content):
+        if not block.strip():
+            continue
+
+        dt_match = TEXT_DATE_STATUS_RE.search(block)
+        if not dt_match:
+            continue
+
+        teams = TEXT_TEAM_RE.findall(block)
+        if len(teams) < 2:
+            continue
+
+        home_team = teams[0]
+        away_team = teams[1]
+
+        key = f"{home_team}-{away_team}"
+        if key in seen:
+            continue
+        seen.add(key)
+
+        match_date = parse_spanish_date(dt_match.group(1), dt_match.group(2))
+
+        score_match = TEXT_SCORE_RE.search(block)
+        score_home = int(score_match.group(1)) if score_match else None
+        score_away = int(score_match.group(2)) if score_match else None
+
+        status = determine_status(dt_match.group(3), score_home is not None)
+
+        url_match_result = TEXT_MATCH_URL_RE.search(block)
+        match_url = f"/partido/{url_match_result.group(1)}" if url_match_result else None
+
+        venue_match = TEXT_VENUE_RE.search(block)
+
+        matches.append(build_match(
+            tournament, config, round_label, home_team, away_team, match_date, status,
+            score_home, score_away, venue_match.group(0) if venue_match else None, match_url
+        ))
+
+    return {"matches": matches}
+
+
+# =============================================================================
+# Main Entry Point
+# =============================================================================
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from team_resolver import report_unresolved
+    from tournament_registry import TOURNAMENTS, round_url
+
+    parser = argparse.ArgumentParser(description="Parse a saved resultados-futbol.com round page")
+    parser.add_argument('tournament', choices=sorted(TOURNAMENTS))
+    parser.add_argument('file', help="saved HTML page")
+    parser.add_argument('--url', help="URL the page was saved from (default: the tournament's default round)")
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        result = parse_html_content(f.read(), args.url or round_url(args.tournament), args.tournament)
+    report_unresolved()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
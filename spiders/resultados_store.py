@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Resultados Store
+Folds the scrapers' resultados/*_resultados.json files into one deduplicated
+store, resultados/resultados_store.json:
+
+    {"files": {"<file name>": {"size": ..., "mtime": ..., "sha256": "..."}},
+     "matches": {"<tournament>|<home>|<away>|<round>": {...scraped match..., "source": "<file name>"}}}
+
+"files" is the manifest of what has been ingested. ingest() only opens files
+that are new or whose size/mtime changed (and only re-parses them if their
+hash changed too), so a run costs the same however many old files there are.
+A fixture is keyed by its pairing and round, not its day, so when a newer
+file reports it on another day (rescheduled kickoff) it replaces the earlier
+copy instead of sitting next to it. Files are ingested oldest first, and a
+record is never replaced by one from an older file. Team slugs are stored as
+scraped; update_scores normalizes them.
+
+compact() deletes ingested files older than a few days: everything in them
+is already in the store, so the directory stops growing over the season.
+
+    python spiders/resultados_store.py ingest
+    python spiders/resultados_store.py compact --older-than 7
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import json_store
+from catalog import match_day
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+RESULTADOS_DIR = BASE_DIR / 'resultados'
+STORE_NAME = 'resultados_store.json'
+FILE_PATTERN = '*_resultados.json'
+
+
+def store_path(resultados_dir=RESULTADOS_DIR):
+    return Path(resultados_dir) / STORE_NAME
+
+
+def load_store(resultados_dir=RESULTADOS_DIR):
+    """Return the store ({"files": {}, "matches": {}} if there is none yet)."""
+    try:
+        with open(store_path(resultados_dir), 'r', encoding='utf-8') as f:
+            store = json.load(f)
+    except (OSError, ValueError):
+        store = {}
+    store.setdefault('files', {})
+    store.setdefault('matches', {})
+    _rekey(store)
+    return store
+
+
+def match_key(match):
+    """Dedup key of a scraped fixture: tournament, home, away and round (local day without a round)."""
+    return '|'.join([match.get('tournament') or '', match.get('homeTeam') or '',
+                     match.get('awayTeam') or '', match.get('round') or match_day(match) or ''])
+
+
+def _file_mtime(store, name):
+    entry = store['files'].get(name)
+    return entry['mtime'] if entry else float('-inf')
+
+
+def _put(store, match, mtime):
+    """Store match unless the store holds the fixture from a newer file."""
+    key = match_key(match)
+    current = store['matches'].get(key)
+    if current is None or _file_mtime(store, current.get('source')) <= mtime:
+        store['matches'][key] = match
+
+
+def _rekey(store):
+    # Stores written before fixtures were keyed by round held one entry per day
+    matches = sorted(store['matches'].values(), key=lambda m: _file_mtime(store, m.get('source')))
+    store['matches'] = {}
+    for match in matches:
+        _put(store, match, _file_mtime(store, match.get('source')))
+
+
+def _file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def ingest(resultados_dir=RESULTADOS_DIR):
+    """Fold new or changed resultados files into the store.
+
+    Returns (store, names of the files parsed this run).
+    """
+    resultados_dir = Path(resultados_dir)
+    store = load_store(resultados_dir)
+    files = store['files']
+    parsed = []
+
+    paths = sorted(resultados_dir.glob(FILE_PATTERN), key=lambda p: p.stat().st_mtime)
+    for path in paths:
+        stat = path.stat()
+        entry = files.get(path.name)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            continue
+
+        digest = _file_hash(path)
+        if not (entry and entry['sha256'] == digest):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    matches = json.load(f).get('matches', [])
+            except (OSError, ValueError) as e:
+                # Left out of the manifest, so it is retried next run
+                print(f"Error loading {path.name}: {e}")
+                continue
+            for match in matches:
+                _put(store, dict(match, source=path.name), stat.st_mtime)
+            parsed.append(path.name)
+            print(f"Loaded {len(matches)} matches from {path.name}")
+        files[path.name] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': digest}
+
+    json_store.write_json(store_path(resultados_dir), store)
+    return store, parsed
+
+
+def compact(older_than_days=7, resultados_dir=RESULTADOS_DIR):
+    """Ingest, then delete ingested files last modified more than older_than_days ago.
+
+    Returns the names of the files removed.
+    """
+    store, _ = ingest(resultados_dir)
+    cutoff = time.time() - older_than_days * 86400
+    removed = []
+    for name, entry in list(store['files'].items()):
+        path = Path(resultados_dir) / name
+        if not path.exists():
+            del store['files'][name]
+            continue
+        stat = path.stat()
+        # Only files whose content is exactly what was ingested
+        if stat.st_mtime < cutoff and stat.st_size == entry['size'] and stat.st_mtime == entry['mtime']:
+            path.unlink()
+            del store['files'][name]
+            removed.append(name)
+
+    # The matches of every removed file were already written by ingest()
+    json_store.write_json(store_path(resultados_dir), store)
+    return removed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold resultados files into resultados_store.json")
+    parser.add_argument('command', choices=['ingest', 'compact'])
+    parser.add_argument('--older-than', type=float, default=7,
+                        help="with compact: delete ingested files older than this many days (default 7)")
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        store, parsed = ingest()
+        print(f"[OK] Parsed {len(parsed)} new files; store holds {len(store['matches'])} matches")
+    else:
+        removed = compact(args.older_than)
+        print(f"[OK] Removed {len(removed)} ingested files: {', '.join(removed) or 'none'}")
@@ -10,6 +10,9 @@ from pathlib import Path
 import re
 import json
 
+import data_lock
+import precompress
+
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 TIMES_DIR = BASE_DIR / 'times'
@@ -119,6 +122,12 @@ def scrape_all_teams():
     
     success_count = 0
     fail_count = 0
+    # Scraped this session; merged into the file as it is on disk when saving
+    scraped = {}
+
+    def merge_scraped(data):
+        for slug, details in scraped.items():
+            data.setdefault(slug, {}).update(details)
     
     # Get all team HTML files
     team_files = list(TIMES_DIR.glob("*.html"))
@@ -160,12 +169,13 @@ def scrape_all_teams():
                 if team_slug not in all_team_data:
                     all_team_data[team_slug] = {}
                 all_team_data[team_slug].update(team_data)
+                scraped.setdefault(team_slug, {}).update(team_data)
                 success_count += 1
                 
                 # Save progress every 5 teams
                 if success_count % 5 == 0:
-                    with open(json_path, 'w', encoding='utf-8') as f:
-                        json.dump(all_team_data, f, ensure_ascii=False, indent=2)
+                    data_lock.update_json(json_path, merge_scraped, default={})
+                    precompress.precompress([json_path])
                     print("  [SAVE] Progress saved")
             else:
                 fail_count += 1
@@ -178,9 +188,9 @@ def scrape_all_teams():
     except KeyboardInterrupt:
         print("\n[WARN] Operations interrupted! Saving progress...")
     
-    # Final Save
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(all_team_data, f, ensure_ascii=False, indent=2)
+    # Final Save (data_lock re-reads the file if another script changed it meanwhile)
+    all_team_data, _ = data_lock.update_json(json_path, merge_scraped, default={})
+    precompress.precompress([json_path])
     
     print()
     print("=" * 60)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Sharded Match Data
+Splits data/matches.json into the small files the home and team pages need:
+
+    data/by-date/YYYY-MM-DD.json      {"date": ..., "matches": [...]}
+    data/by-date/index.json           {"dates": {"YYYY-MM-DD": <match count>}}
+    data/by-tournament/<id>.json      {"tournament": ..., "matches": [...]}
+    data/by-team/<id>.json            {"team": ..., "upcoming": [...], "past": [...]}
+
+Dates are the local calendar day of matchDate (Brasília time). Team shards
+split on status (finished matches are "past"), sort upcoming matches by
+kickoff and past ones most recent first, and add "kickoff" (epoch
+milliseconds) to every match so team pages compare numbers, not dates.
+
+matches.json stays the canonical file; shards are rewritten only when their
+content changes, and shards without matches are removed.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import json_store
+import page_index
+from catalog import match_day
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+BY_DATE_DIR = DATA_DIR / 'by-date'
+BY_TOURNAMENT_DIR = DATA_DIR / 'by-tournament'
+BY_TEAM_DIR = DATA_DIR / 'by-team'
+DATES_INDEX_FILE = BY_DATE_DIR / 'index.json'
+
+
+def shard_files():
+    """Every shard currently on disk (used by precompress)."""
+    return (sorted(BY_DATE_DIR.glob('*.json')) + sorted(BY_TOURNAMENT_DIR.glob('*.json'))
+            + sorted(BY_TEAM_DIR.glob('*.json')))
+
+
+def kickoff_ms(match):
+    """matchDate as epoch milliseconds, or None if missing or malformed."""
+    try:
+        return int(datetime.fromisoformat(match['matchDate'].replace('Z', '+00:00')).timestamp() * 1000)
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+def team_shard(team_id, team_matches):
+    """Upcoming (soonest first) and past (latest first) matches of one team."""
+    upcoming, past = [], []
+    for match in team_matches:
+        kickoff = kickoff_ms(match)
+        if kickoff is None:
+            continue
+        entry = dict(match, kickoff=kickoff)
+        (past if match.get('status') == 'finished' else upcoming).append(entry)
+    upcoming.sort(key=lambda m: (m['kickoff'], m.get('id', '')))
+    past.sort(key=lambda m: (-m['kickoff'], m.get('id', '')))
+    return {"team": team_id, "upcoming": upcoming, "past": past}
+
+
+def build_shards(matches, team_ids=()):
+    """Return {path: payload} for every shard of matches (in matches.json order).
+
+    team_ids get a team shard even when they have no matches.
+    """
+    by_date = defaultdict(list)
+    by_tournament = defaultdict(list)
+    by_team = {team_id: [] for team_id in team_ids}
+    for match in matches:
+        for team_id in {match.get('homeTeam'), match.get('awayTeam')} - {None, ''}:
+            by_team.setdefault(team_id, []).append(match)
+        day = match_day(match)
+        if day:
+            by_date[day].append(match)
+        if match.get('tournament'):
+            by_tournament[match['tournament']].append(match)
+
+    shards = {DATES_INDEX_FILE: {"dates": {day: len(by_date[day]) for day in sorted(by_date)}}}
+    for day, day_matches in by_date.items():
+        shards[BY_DATE_DIR / (day + '.json')] = {"date": day, "matches": day_matches}
+    for tournament_id, tournament_matches in by_tournament.items():
+        shards[BY_TOURNAMENT_DIR / (tournament_id + '.json')] = {"tournament": tournament_id,
+                                                                 "matches": tournament_matches}
+    for team_id, team_matches in by_team.items():
+        shards[BY_TEAM_DIR / (team_id + '.json')] = team_shard(team_id, team_matches)
+    return shards
+
+
+def write_shards(matches, team_ids=()):
+    """Write the shards of matches and delete the ones no longer produced.
+
+    Returns (written paths, unchanged count, removed paths).
+    """
+    shards = build_shards(matches, team_ids)
+    written = []
+    unchanged = 0
+    for path in sorted(shards):
+        if json_store.write_json(path, shards[path], indent=None):
+            written.append(path)
+        else:
+            unchanged += 1
+
+    removed = []
+    for path in shard_files():
+        if path not in shards:
+            for stale in [path] + [path.with_name(path.name + s) for s in page_index.PAGE_SIBLING_SUFFIXES]:
+                if stale.exists():
+                    stale.unlink()
+            removed.append(path)
+    return written, unchanged, removed
+
+
+if __name__ == "__main__":
+    from catalog import load_catalog
+
+    catalog = load_catalog(DATA_DIR)
+    written, unchanged, removed = write_shards(catalog.matches, catalog.team_by_id)
+    print(f"[OK] Shards written: {len(written)}, unchanged: {unchanged}, removed: {len(removed)}")
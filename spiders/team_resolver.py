@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Team Resolver
+Maps the team names and slugs found in scraped pages and data files to the
+team ids of data/teams.json, for scrapers, update_scores and the page
+generators alike:
+
+    resolve('São Paulo FC')            # -> 'saopaulo'
+    resolve('flamengo-rio-janeiro')    # -> 'flamengo'
+    resolve_team('Unknown FC')         # -> 'unknown-fc' (slug, reported as unresolved)
+    report_unresolved()
+
+The alias index is built once from teams.json (id, slug, name and "aliases"
+of each team, accent- and punctuation-folded) plus TEAM_OVERRIDES. Names not
+found as they are are retried with SUFFIXES stripped ('santos-fc' -> 'santos').
+Results are memoized, so each distinct name is resolved once per process.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from catalog import DATA_DIR, alias_key, load_catalog
+
+# Names that folding and suffix stripping cannot work out -> team id
+TEAM_OVERRIDES = {
+    "botafogo-sp": "botafogorp",
+    "primavera-sp": "esporteclubeprimavera",
+    "noroeste": "esporteclubenoroeste",
+    "a-portuguesa-d": "portuguesa",
+    "guarani-campinas": "guarani",
+    "cfrj-marica": "marica",
+}
+
+# Stripped from the end of a slug, in any order, when the full name is unknown
+SUFFIXES = ("-fc", "-sp", "-rj", "-br", "-rio-janeiro", "-sao-paulo")
+
+
+def slugify(text):
+    """Convert a name to a URL-friendly slug ('São Bernardo FC' -> 'sao-bernardo-fc')."""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'[^a-z0-9]+', '-', text.lower())
+    return text.strip('-')
+
+
+class TeamResolver:
+    """Alias index over a list of teams.json entries."""
+
+    def __init__(self, teams, overrides=TEAM_OVERRIDES):
+        self.ids = {team['id'] for team in teams if team.get('id')}
+        self.index = {}
+        for team in teams:
+            names = [team.get('id'), team.get('slug'), team.get('name')] + list(team.get('aliases', []))
+            for name in names:
+                if name:
+                    self.index.setdefault(alias_key(name), team['id'])
+        for name, team_id in overrides.items():
+            if team_id in self.ids:
+                self.index[alias_key(name)] = team_id
+        self.unresolved = Counter()
+        self._cache = {}
+
+    def _lookup(self, name):
+        team_id = self.index.get(alias_key(name))
+        if team_id:
+            return team_id
+
+        slug = slugify(name)
+        stripped = True
+        while stripped:
+            stripped = False
+            for suffix in SUFFIXES:
+                if slug.endswith(suffix) and len(slug) > len(suffix):
+                    slug = slug[:-len(suffix)]
+                    team_id = self.index.get(alias_key(slug))
+                    if team_id:
+                        return team_id
+                    stripped = True
+        return None
+
+    def resolve(self, name):
+        """Return the team id for a name, id, slug or alias, or None (counted as unresolved)."""
+        if not name:
+            return None
+        if name not in self._cache:
+            self._cache[name] = self._lookup(name)
+        team_id = self._cache[name]
+        if team_id is None:
+            self.unresolved[name] += 1
+        return team_id
+
+
+_resolver = None
+
+
+def get_resolver(data_dir=DATA_DIR, reload=False):
+    """The resolver for teams.json, built on first use (reload=True rebuilds it after teams.json changes)."""
+    global _resolver
+    if _resolver is None or reload:
+        previous = _resolver
+        _resolver = TeamResolver(load_catalog(data_dir, reload=reload).teams)
+        if previous is not None:
+            _resolver.unresolved.update(previous.unresolved)
+    return _resolver
+
+
+def resolve(name):
+    """Team id for name, or None."""
+    return get_resolver().resolve(name)
+
+
+def resolve_team(name):
+    """Team id for name, or its slug when teams.json does not know it."""
+    return resolve(name) or slugify(name)
+
+
+def team_key(name):
+    """Key for comparing teams: the team id, or the folded name when it is unknown."""
+    return resolve(name) or alias_key(name)
+
+
+def report_unresolved():
+    """Print every name that could not be resolved so far, once. Returns them."""
+    resolver = get_resolver()
+    names = sorted(resolver.unresolved)
+    if names:
+        print(f"[WARN] {len(names)} team names not found in teams.json (add them to its \"aliases\" "
+              f"or to TEAM_OVERRIDES): {', '.join(names)}")
+    resolver.unresolved.clear()
+    return names
+
+
+if __name__ == "__main__":
+    import sys
+
+    for name in sys.argv[1:]:
+        print(f"{name} -> {resolve(name)}")
+    report_unresolved()
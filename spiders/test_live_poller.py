@@ -0,0 +1,77 @@
+import asyncio
+import json
+import shutil
+import threading
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+
+import change_log
+import data_lock
+import update_scores
+from catalog import DATA_FILES
+from live_poller import LivePoller
+
+BASE_DIR = Path(__file__).parent.parent
+# Recorded round page, at its path on resultados-futbol.com
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'resultados'
+MATCH_ID = "paulistao26-corinthians-vs-pontepreta-11-01-2026"
+
+
+class RoundPageHandler(SimpleHTTPRequestHandler):
+    # Round pages have no extension
+    extensions_map = {'': 'text/html; charset=utf-8'}
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def round_site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(RoundPageHandler, directory=str(FIXTURES_DIR)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Copy of data/ with the Corinthians match not started yet."""
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for filename in DATA_FILES.values():
+        shutil.copy(BASE_DIR / 'data' / filename, data_dir / filename)
+
+    matches_file = data_dir / 'matches.json'
+    data = json.loads(matches_file.read_text(encoding='utf-8'))
+    for match in data['matches']:
+        if match['id'] == MATCH_ID:
+            match.update(status="scheduled", score={"home": None, "away": None})
+    matches_file.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+    monkeypatch.setattr(update_scores, "MATCHES_FILE", matches_file)
+    monkeypatch.setattr(data_lock, "LOCK_DIR", tmp_path / 'locks')
+    monkeypatch.setattr(change_log, "append_changes", lambda changes: None)
+    monkeypatch.setattr(update_scores, "rebuild_pages", lambda match_ids: None)
+    return data_dir
+
+
+def test_one_cycle_writes_live_score(round_site, data_dir):
+    clock = lambda: datetime.fromisoformat("2026-01-11T16:50:00-03:00")
+    poller = LivePoller(base_url=round_site, clock=clock)
+
+    asyncio.run(poller.cycle())
+
+    matches = json.loads((data_dir / 'matches.json').read_text(encoding='utf-8'))['matches']
+    match = next(m for m in matches if m['id'] == MATCH_ID)
+    assert match['status'] == "live"
+    assert match['score'] == {"home": 1, "away": 0}
+    assert list(poller.next_poll) == [round_site + "/competicion/paulistaa1/2026/grupo1/jornada1"]
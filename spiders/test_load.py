@@ -1,13 +1,13 @@
-import json
 from pathlib import Path
 
+from catalog import load_catalog
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'data'
 
 def test_load():
     try:
-        with open(DATA_DIR / 'matches.json', 'r', encoding='utf-8') as f:
-            matches = json.load(f)['matches']
+        matches = load_catalog(DATA_DIR).matches
         print(f"Loaded {len(matches)} matches.")
         for m in matches:
             print(f"- {m['id']}")
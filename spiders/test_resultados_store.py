@@ -0,0 +1,73 @@
+import json
+import os
+
+import resultados_store
+import update_scores
+
+OLD_DAY = "2026-01-11T16:00:00-03:00"
+NEW_DAY = "2026-01-12T19:30:00-03:00"
+WEEKS_LATER = "2026-02-01T16:00:00-03:00"
+
+
+def scraped(match_date):
+    return {
+        "id": f"paulistao26-corinthians-vs-pontepreta-{match_date[:10]}",
+        "tournament": "paulistao26",
+        "homeTeam": "corinthians",
+        "awayTeam": "pontepreta",
+        "matchDate": match_date,
+        "round": "Jornada 1",
+        "status": "scheduled",
+        "score": {"home": None, "away": None},
+    }
+
+
+def write_resultados(directory, name, match, mtime):
+    path = directory / name
+    path.write_text(json.dumps({"matches": [match]}), encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+def test_rescheduled_kickoff_moves_match(tmp_path, monkeypatch):
+    write_resultados(tmp_path, "10012026-080000_resultados.json", scraped(OLD_DAY), 1_000_000)
+    resultados_store.ingest(tmp_path)
+    write_resultados(tmp_path, "11012026-080000_resultados.json", scraped(NEW_DAY), 1_000_100)
+
+    monkeypatch.setattr(update_scores, "RESULTADOS_DIR", tmp_path)
+    records = update_scores.load_resultados()
+
+    # The newer file replaced the fixture instead of adding a second day
+    assert [r["matchDate"] for r in records] == [NEW_DAY]
+
+    match = dict(scraped(OLD_DAY), matchURL="/paulistao26/11-01-2026/corinthians-vs-ponte-preta/")
+    data = {"matches": [match]}
+    assert update_scores.apply_records(data, update_scores.index_results(records)) == 1
+    assert match["matchDate"] == NEW_DAY
+    assert match["matchURL"] == "/paulistao26/12-01-2026/corinthians-vs-ponte-preta/"
+
+
+def test_kickoff_moved_by_weeks_matches_by_round(tmp_path, monkeypatch):
+    write_resultados(tmp_path, "10012026-080000_resultados.json", scraped(OLD_DAY), 1_000_000)
+    resultados_store.ingest(tmp_path)
+    write_resultados(tmp_path, "20012026-080000_resultados.json", scraped(WEEKS_LATER), 1_000_100)
+
+    monkeypatch.setattr(update_scores, "RESULTADOS_DIR", tmp_path)
+    records = update_scores.load_resultados()
+
+    # Three weeks is past MAX_DATE_DRIFT_DAYS; the stored round names it differently
+    match = dict(scraped(OLD_DAY), round="1ª Rodada",
+                 matchURL="/paulistao26/11-01-2026/corinthians-vs-ponte-preta/")
+    data = {"matches": [match]}
+    assert update_scores.apply_records(data, update_scores.index_results(records)) == 1
+    assert match["matchDate"] == WEEKS_LATER
+    assert match["matchURL"] == "/paulistao26/01-02-2026/corinthians-vs-ponte-preta/"
+
+
+def test_older_file_does_not_replace_newer(tmp_path):
+    write_resultados(tmp_path, "b_resultados.json", scraped(NEW_DAY), 1_000_100)
+    resultados_store.ingest(tmp_path)
+    write_resultados(tmp_path, "a_resultados.json", scraped(OLD_DAY), 1_000_000)
+
+    store, parsed = resultados_store.ingest(tmp_path)
+    assert parsed == ["a_resultados.json"]
+    assert [m["matchDate"] for m in store["matches"].values()] == [NEW_DAY]
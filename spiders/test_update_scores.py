@@ -0,0 +1,21 @@
+import update_scores
+
+
+def record(status, source="resultados", **fields):
+    return dict({"status": status, "score": {"home": None, "away": None}, "source": source}, **fields)
+
+
+def test_suspended_match_can_be_postponed():
+    match = {"status": "suspended", "score": {"home": 1, "away": 0}}
+    assert update_scores.reconcile_match(match, [record("postponed")]) == {"status": "postponed"}
+
+
+def test_postponed_match_can_be_suspended():
+    match = {"status": "postponed"}
+    assert update_scores.reconcile_match(match, [record("suspended")]) == {"status": "suspended"}
+
+
+def test_records_behind_the_stored_status_are_stale():
+    match = {"status": "finished", "score": {"home": 2, "away": 1}}
+    assert update_scores.reconcile_match(match, [record("live", score={"home": 1, "away": 1})]) == {}
+    assert update_scores.reconcile_match({"status": "suspended"}, [record("scheduled")]) == {}
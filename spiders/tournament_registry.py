@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Tournament Registry
+The competitions scraped from resultados-futbol.com, as config for the one
+scraper engine (resultados_scraper) and the fetcher/poller that drive it:
+
+    "url"     round page, with {round} for the round (jornada) number
+    "state"   venue state written on every match
+    "venues"  stadium name fragment (lowercase) -> city
+    "round"   round fetched when none is given (and the round name used when
+              a page URL carries no round number)
+
+The key is the tournament id of data/tournaments.json; it is also the prefix
+of the match ids. Adding a state championship (Mineiro, Gaúcho, Baiano...)
+means adding its entry here, plus the tournament in data/tournaments.json.
+"""
+
+TOURNAMENTS = {
+    "paulistao26": {
+        "url": "https://www.resultados-futbol.com/competicion/paulistaa1/2026/grupo1/jornada{round}",
+        "state": "SP",
+        "round": 5,
+        "venues": {
+            'morumbi': 'São Paulo',
+            'cícero pompeu de toledo': 'São Paulo',
+            'pacaembu': 'São Paulo',
+            'allianz parque': 'São Paulo',
+            'neo química arena': 'São Paulo',
+            'vila belmiro': 'Santos',
+            'urbano caldeira': 'Santos',
+            'moisés lucarelli': 'Campinas',
+            'brinco de ouro': 'Campinas',
+            'nabi abi chedid': 'Bragança Paulista',
+            'jorge ismael de biase': 'Novo Horizonte',
+            'alfredo de castilho': 'Bauru',
+            'benito agnelo castellano': 'Rio Claro',
+            'santa cruz': 'Ribeirão Preto',
+            'josé maria de campos maia': 'Mirassol',
+            'walter ribeiro': 'Sorocaba',
+            'primeiro de maio': 'São Bernardo do Campo',
+        },
+    },
+    "carioca26": {
+        "url": "https://www.resultados-futbol.com/competicion/carioca_1/2026/grupo1/jornada{round}",
+        "state": "RJ",
+        "round": 4,
+        "venues": {
+            'maracanã': 'Rio de Janeiro',
+            'engenhão': 'Rio de Janeiro',
+            'nilton santos': 'Rio de Janeiro',
+            'são januário': 'Rio de Janeiro',
+        },
+    },
+}
+
+
+def get_tournament(tournament):
+    """Registry entry of tournament (KeyError if it is not registered)."""
+    return TOURNAMENTS[tournament]
+
+
+def round_url(tournament, round_number=None):
+    """Round page of tournament (its default round when round_number is None)."""
+    config = get_tournament(tournament)
+    return config['url'].format(round=round_number if round_number is not None else config['round'])
@@ -1,180 +1,323 @@
 #!/usr/bin/env python3
 """
 Update Match Scores
-Reads matches.json and updates null scores using data from resultados files.
-Only updates scores for matches with status "finished" in resultados.
+Reconciles matches.json with the match state scraped into resultados files:
+status (live, finished, postponed, suspended), score and kickoff time are
+compared field by field and every change is written in one save.
+Resultados files are read through resultados_store, which only parses files
+it has not seen before.
 
 Run daily at 05:00 AM via Windows Task Scheduler.
 """
 
-import json
 import re
 from pathlib import Path
 from datetime import datetime
 
+import change_log
+import data_lock
+import generate_match_pages
+import resultados_store
+from catalog import load_catalog, match_day
+from team_resolver import report_unresolved, team_key
+
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 MATCHES_FILE = BASE_DIR / "data" / "matches.json"
 RESULTADOS_DIR = BASE_DIR / "resultados"
 
-# Team name normalization mapping
-# Maps resultados team names to matches.json team names
-TEAM_NAME_MAP = {
-    # Paulistão teams
-    "botafogo-sp": "botafogorp",
-    "primavera-sp": "esporteclubeprimavera",
-    "noroeste": "esporteclubenoroeste",
-    "ponte-preta": "pontepreta",
-    "sao-bernardo-fc": "saobernardofc",
-    "santos-fc": "santos",
-    "corinthians-sao-paulo": "corinthians",
-    "sao-paulo-fc": "saopaulo",
-    "a-portuguesa-d": "portuguesa",
-    "velo-clube": "veloclube",
-    "guarani-campinas": "guarani",
-    "mirassol": "mirassol",
-    "bragantino": "bragantino",
-    "novorizontino": "novorizontino",
-    "palmeiras": "palmeiras",
-    "capivariano": "capivariano",
-    # Carioca teams
-    "flamengo-rio-janeiro": "flamengo",
-    "fluminense-rio-janeiro": "fluminense",
-    "botafogo-rio-janeiro": "botafogo",
-    "vasco-da-gama": "vasco",
-    "cfrj-marica": "marica",
-    "volta-redonda": "voltaredonda",
-    "madureira-rj": "madureira",
-    "sampaio-correa-rj": "sampaiocorrea",
-    "boavista-br": "boavista",
-    "nova-iguacu": "novaiguacu",
-}
-
+# A record whose date is off by at most this much still belongs to the match of
+# the same pairing (rescheduled kickoff); further apart it is another fixture,
+# unless it is reported for the same tournament round (postponed for weeks)
+MAX_DATE_DRIFT_DAYS = 3
 
-def normalize_team_name(name):
-    """Normalize team name for matching."""
-    # First check if there's a direct mapping
-    if name in TEAM_NAME_MAP:
-        return TEAM_NAME_MAP[name]
+# Match fields taken from incoming records
+RECONCILED_FIELDS = ("status", "score", "matchDate")
 
-    # Otherwise, normalize by removing hyphens and converting to lowercase
-    normalized = name.lower().replace("-", "").replace(" ", "")
-    return normalized
+# When several sources report the same match, the higher number wins field by
+# field. Sources not listed rank 0.
+SOURCE_PRECEDENCE = {
+    "resultados": 1,
+    # live_poller.py reads the result pages during the match
+    "live": 2,
+}
 
+# Status only moves forward: a record ranked below the stored status is stale
+STATUS_RANK = {
+    "scheduled": 0,
+    "postponed": 0,
+    "live": 1,
+    "suspended": 1,
+    "finished": 2,
+}
+# ...except between these: a suspended match can be postponed and the other way round
+INTERRUPTED_STATUSES = {"postponed", "suspended"}
+# Statuses whose score is meaningful
+SCORED_STATUSES = {"live", "suspended", "finished"}
 
 def load_matches():
-    """Load matches from matches.json."""
+    """Load matches from matches.json. Returns (data, data_lock version)."""
     try:
-        with open(MATCHES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return data_lock.read_json(MATCHES_FILE)
     except Exception as e:
         print(f"Error loading matches.json: {e}")
-        return None
+        return None, None
+
 
+def save_matches(data, version=None):
+    """Save matches to matches.json (atomically, skipped when unchanged).
 
-def save_matches(data):
-    """Save matches to matches.json."""
+    Raises data_lock.ConflictError if matches.json is no longer at version
+    (for this write only, never from the page rebuild). The pages of the
+    changed matches and the derived data files are rebuilt right away,
+    without a full generate_match_pages run.
+    """
     try:
-        with open(MATCHES_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        return True
+        written, changes = change_log.write_matches(MATCHES_FILE, data, "update_scores", expected=version)
+    except data_lock.ConflictError:
+        raise
     except Exception as e:
         print(f"Error saving matches.json: {e}")
         return False
 
+    if written and changes:
+        rebuild_pages(change_log.changed_match_ids(changes))
+    return True
+
+
+def rebuild_pages(match_ids):
+    """Rebuild the pages of match_ids. A failure is reported; matches.json is already saved."""
+    try:
+        generate_match_pages.generate_match_pages(match_ids=match_ids)
+    except data_lock.ConflictError:
+        # The build already retried on its own; matches.json is saved, only the pages are behind
+        print(f"matches.json kept changing while rebuilding the pages of {len(match_ids)} updated matches; "
+              f"they are rebuilt by the next generate_match_pages.py run")
+    except Exception as e:
+        print(f"Error rebuilding the pages of {len(match_ids)} updated matches "
+              f"(matches.json is saved; run generate_match_pages.py): {e}")
+
 
 def load_resultados():
-    """Load all resultados files and extract finished matches."""
-    finished_matches = []
+    """Load the latest scraped state of every match from the resultados store (new files are ingested first)."""
+    records = []
 
     if not RESULTADOS_DIR.exists():
         print(f"Resultados directory not found: {RESULTADOS_DIR}")
-        return finished_matches
-
-    for json_file in RESULTADOS_DIR.glob("*_resultados.json"):
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+        return records
+
+    store, parsed = resultados_store.ingest(RESULTADOS_DIR)
+    print(f"Ingested {len(parsed)} new resultados files ({len(store['files'])} tracked)")
+
+    for match in store["matches"].values():
+        records.append({
+            "homeTeam": team_key(match.get("homeTeam", "")),
+            "awayTeam": team_key(match.get("awayTeam", "")),
+            "status": match.get("status"),
+            "score": match.get("score"),
+            "matchDate": match.get("matchDate"),
+            "tournament": match.get("tournament"),
+            "round": match.get("round"),
+            "source": "resultados",
+            "file": match.get("source"),
+        })
+
+    return records
+
+
+# Sources of incoming match state, read once per run
+SOURCES = {
+    "resultados": load_resultados,
+}
 
-            matches = data.get("matches", [])
-            for match in matches:
-                # Only consider finished matches
-                if match.get("status") == "finished":
-                    score = match.get("score", {})
-                    if score.get("home") is not None and score.get("away") is not None:
-                        finished_matches.append({
-                            "homeTeam": normalize_team_name(match.get("homeTeam", "")),
-                            "awayTeam": normalize_team_name(match.get("awayTeam", "")),
-                            "score": score,
-                            "matchDate": match.get("matchDate"),
-                            "source": json_file.name
-                        })
 
-            print(f"Loaded {len(matches)} matches from {json_file.name}")
+def load_records():
+    """Load the records of every source."""
+    records = []
+    for name, loader in SOURCES.items():
+        source_records = loader()
+        print(f"Found {len(source_records)} records from {name}")
+        records.extend(source_records)
+    return records
 
-        except Exception as e:
-            print(f"Error loading {json_file.name}: {e}")
 
-    return finished_matches
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
 
 
-def find_matching_result(match, finished_results):
-    """Find a matching result for a given match."""
-    home_team = normalize_team_name(match.get("homeTeam", ""))
-    away_team = normalize_team_name(match.get("awayTeam", ""))
+def round_number(value):
+    """Number of a round name ('5ª Rodada', 'Jornada 5' -> 5), or None."""
+    number = re.search(r'\d+', value or '')
+    return int(number.group()) if number else None
+
+
+def index_results(records):
+    """Index records by (home, away, day) and by (home, away) pairing.
+
+    Each key holds every record for it (one per source). Pairing lists are
+    kept for the nearest-date fallback.
+    """
+    by_key = {}
+    by_pairing = {}
+    for record in records:
+        pairing = (record["homeTeam"], record["awayTeam"])
+        by_key.setdefault(pairing + (match_day(record),), []).append(record)
+        by_pairing.setdefault(pairing, []).append(record)
+    return {"by_key": by_key, "by_pairing": by_pairing}
+
+
+def find_matching_records(match, result_index):
+    """Find the records for a match: same pairing and day, else the nearest date within
+    MAX_DATE_DRIFT_DAYS, else the same pairing in the same tournament round."""
+    pairing = (team_key(match.get("homeTeam", "")), team_key(match.get("awayTeam", "")))
+
+    records = result_index["by_key"].get(pairing + (match_day(match),))
+    if records:
+        return records
+
+    candidates = result_index["by_pairing"].get(pairing, [])
+    match_date = _parse_date(match.get("matchDate"))
+    if match_date is None:
+        # Without a date only an unambiguous pairing is safe
+        return candidates if len(candidates) == 1 else []
+
+    best, best_drift = None, None
+    for candidate in candidates:
+        candidate_date = _parse_date(candidate.get("matchDate"))
+        if candidate_date is None:
+            continue
+        drift = abs((candidate_date - match_date).total_seconds())
+        if drift <= MAX_DATE_DRIFT_DAYS * 86400 and (best_drift is None or drift < best_drift):
+            best, best_drift = candidate, drift
+    if best is None:
+        # Moved further than the drift allows (e.g. postponed by weeks): the round still tells
+        match_round = round_number(match.get("round"))
+        same_round = [c for c in candidates if match_round is not None
+                      and c.get("tournament") == match.get("tournament")
+                      and round_number(c.get("round")) == match_round]
+        if len({match_day(c) for c in same_round}) != 1:
+            return []
+        best = same_round[0]
+    return result_index["by_key"][pairing + (match_day(best),)]
+
+
+def _proposed_value(record, field):
+    """The value a record proposes for field, or None if it has nothing to say about it."""
+    value = record.get(field)
+    if field == "status":
+        return value if value in STATUS_RANK else None
+    if field == "score":
+        if not isinstance(value, dict) or value.get("home") is None or value.get("away") is None:
+            return None
+        if record.get("status") not in SCORED_STATUSES:
+            return None
+        return {"home": value["home"], "away": value["away"]}
+    return value
+
+
+def is_stale(current, proposed):
+    """Whether a record with status proposed is behind a match with status current."""
+    if current in INTERRUPTED_STATUSES and proposed in INTERRUPTED_STATUSES:
+        return False
+    return STATUS_RANK.get(proposed, -1) < STATUS_RANK.get(current, 0)
+
+
+def reconcile_match(match, records):
+    """Compare records with a match field by field. Returns {field: new value} for what differs.
+
+    Records whose status is behind the stored one (e.g. "live" for a finished
+    match) are stale and ignored. For each field the record of the source with
+    the highest SOURCE_PRECEDENCE that has a value wins.
+    """
+    records = [r for r in records if not is_stale(match.get("status"), r.get("status"))]
+    # Highest precedence last, so it is the one kept (sorted() is stable for ties)
+    records = sorted(records, key=lambda r: SOURCE_PRECEDENCE.get(r["source"], 0))
+
+    changes = {}
+    for field in RECONCILED_FIELDS:
+        proposal = None
+        for record in records:
+            value = _proposed_value(record, field)
+            if value is not None:
+                proposal = value
+        if proposal is not None and match.get(field) != proposal:
+            changes[field] = proposal
+    return changes
+
+
+def apply_records(matches_data, result_index):
+    """Reconcile every match with its records, in memory. Returns the number of matches changed."""
+    teams = load_catalog(MATCHES_FILE.parent).team_by_id
+    updated_count = 0
 
-    for result in finished_results:
-        if result["homeTeam"] == home_team and result["awayTeam"] == away_team:
-            return result
+    for match in matches_data.get("matches", []):
+        records = find_matching_records(match, result_index)
+        if not records:
+            continue
+
+        changes = reconcile_match(match, records)
+        if changes:
+            match.update(changes)
+            if "matchDate" in changes:
+                # The page path carries the date; set the new matchURL now so matches.json is written once
+                generate_match_pages.assign_match_url(match, teams)
+            updated_count += 1
+            details = ", ".join(f"{field}={value}" for field, value in changes.items())
+            print(f"Updated: {match.get('homeTeam')} vs {match.get('awayTeam')} -> {details}")
+    return updated_count
+
+
+def reconcile_and_save(records):
+    """Apply records to matches.json and save it once.
+
+    If another script writes matches.json meanwhile, the records are applied
+    again to its version. Returns the number of matches updated, or None if
+    matches.json could not be read or written.
+    """
+    result_index = index_results(records)
+
+    for attempt in range(data_lock.RETRIES):
+        matches_data, version = load_matches()
+        if not matches_data:
+            print("Failed to load matches.json")
+            return None
+
+        updated_count = apply_records(matches_data, result_index)
+        if updated_count == 0:
+            return 0
+        try:
+            if save_matches(matches_data, version):
+                print(f"\nSaved {updated_count} match updates to matches.json")
+                return updated_count
+            print("\nFailed to save updates")
+            return None
+        except data_lock.ConflictError:
+            # Someone else wrote matches.json before this save (save_matches raises it for its own
+            # write only): reconcile again against their version
+            print("\nmatches.json changed while updating it, retrying")
 
+    print("\nGave up: matches.json kept changing")
     return None
 
 
 def update_scores():
-    """Main function to update null scores in matches.json."""
+    """Main function to reconcile matches.json with the incoming match state."""
     print("=" * 60)
     print(f"Score Update Job - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     print()
 
-    # Load matches
-    matches_data = load_matches()
-    if not matches_data:
-        print("Failed to load matches.json")
-        return
-
-    # Load finished results from resultados
-    finished_results = load_resultados()
-    print(f"\nFound {len(finished_results)} finished matches in resultados")
+    # Load the incoming state of every source
+    records = load_records()
     print()
 
-    # Find matches with null scores
-    matches_list = matches_data.get("matches", [])
-    updated_count = 0
+    if reconcile_and_save(records) == 0:
+        print("\nNo matches to update")
 
-    for match in matches_list:
-        score = match.get("score", {})
-
-        # Check if score is null
-        if score.get("home") is None or score.get("away") is None:
-            # Try to find matching result
-            result = find_matching_result(match, finished_results)
-
-            if result:
-                # Update the score
-                match["score"] = result["score"]
-                match["status"] = "finished"
-                updated_count += 1
-                print(f"Updated: {match.get('homeTeam')} vs {match.get('awayTeam')} -> {result['score']['home']}-{result['score']['away']}")
-
-    # Save if there were updates
-    if updated_count > 0:
-        if save_matches(matches_data):
-            print(f"\nSaved {updated_count} score updates to matches.json")
-        else:
-            print("\nFailed to save updates")
-    else:
-        print("\nNo scores to update")
+    report_unresolved()
 
     print()
     print("=" * 60)